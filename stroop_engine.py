@@ -0,0 +1,269 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+from stroop_stats import StroopStats
+from 拟合模型库 import fit_model, score_to_focus
+
+# 计分规则：正确 +1，错误 −5，中性试次不计分
+CORRECT_POINTS = 1
+ERROR_POINTS = -5
+
+# 每个阶段中每个颜色词重复的轮数（每轮包含一个一致试次和一个不一致试次）
+PRACTICE_REPEATS = 5
+TEST_REPEATS = 20
+
+# 批量模拟时每块同时模拟的会话数
+SIMULATION_CHUNK = 10000
+
+# 得分→开敞度分析中模拟的开敞度水平（%），与 拟合_score-openness.py 的原始数据相同
+OPENNESS_LEVELS = (0, 12.5, 25, 37.5, 50, 62.5, 75, 87.5, 100)
+
+# 模拟各开敞度水平时，被试错误率相对基准值的随机倍数范围
+ERROR_RATE_SPREAD = (0.5, 2.0)
+
+
+class StroopEngine:
+    """
+    与界面无关的斯特鲁普任务逻辑：生成试次序列、判分（+1/−5）与统计，可在没有显示器的环境中运行。
+    words 为颜色词（同时作为显示颜色的名称），response_map 把作答选项（按钮文字）映射到颜色词
+    """
+
+    def __init__(self, words, response_map, rng=None, practice_repeats=PRACTICE_REPEATS, test_repeats=TEST_REPEATS):
+        self.words = list(words)
+        self.response_map = dict(response_map)
+        self.responses = list(self.response_map)
+        self.correct_responses = {color: response for response, color in self.response_map.items()}
+        self.rng = rng or random.Random()
+        self.practice_repeats = practice_repeats
+        self.test_repeats = test_repeats
+        self.stats = StroopStats()
+        self.reset()
+
+    def _block(self, repeats, is_practice):
+        trials = []
+        for _ in range(repeats):
+            for word in self.words:
+                # 一致试次
+                trials.append({"word": word, "color": word, "type": "congruent", "is_practice": is_practice})
+                # 不一致试次（随机选择不同颜色）
+                color = self.rng.choice([c for c in self.words if c != word])
+                trials.append({"word": word, "color": color, "type": "incongruent", "is_practice": is_practice})
+        self.rng.shuffle(trials)
+        return trials
+
+    def reset(self):
+        """
+        生成新的试次序列（练习在前，正式在后），得分与统计清零
+        """
+        self.trials = self._block(self.practice_repeats, True) + self._block(self.test_repeats, False)
+        self.current_trial = 0
+        self.score = 0
+        self.stats.reset()
+
+    @property
+    def finished(self):
+        return self.current_trial >= len(self.trials)
+
+    def current(self):
+        return None if self.finished else self.trials[self.current_trial]
+
+    def respond(self, response, reaction_time, render_latency=0.0):
+        """
+        对当前试次作答：判分、累加统计并进入下一个试次，返回该试次的记录
+        """
+        trial = self.trials[self.current_trial]
+        if trial["color"] == "Black":
+            # 中性试次不计分
+            correct = None
+        else:
+            correct = (self.response_map[response] == trial["color"])
+            self.score += CORRECT_POINTS if correct else ERROR_POINTS
+        self.stats.add(trial["is_practice"], trial["type"], correct, reaction_time)
+
+        result = {
+            "trial_number": self.current_trial + 1,
+            "word": trial["word"],
+            "display_color": trial["color"],
+            "response_color": response,
+            "is_correct": correct,
+            "reaction_time": reaction_time,
+            "render_latency": render_latency,
+            "trial_type": trial["type"],
+            "is_practice": trial["is_practice"],
+            "score": self.score
+        }
+        self.current_trial += 1
+        return result
+
+    def summary(self):
+        return dict(self.stats.summary(), score=self.score)
+
+
+class SimulatedResponder:
+    """
+    模拟被试：反应时间服从 ex-Gaussian 分布（正态 mu、sigma 加指数 tau），不一致试次另加干扰时间 interference；
+    一致/不一致试次分别以 error_rate / incongruent_error_rate 的概率按错，
+    不一致试次的错误中 reading_share 的比例是按了字义对应的颜色（读字错误），其余随机选择其他颜色
+    """
+
+    def __init__(self, mu=0.55, sigma=0.08, tau=0.15, interference=0.08, error_rate=0.02,
+                 incongruent_error_rate=0.08, reading_share=0.7, seed=None):
+        self.mu = mu
+        self.sigma = sigma
+        self.tau = tau
+        self.interference = interference
+        self.error_rate = error_rate
+        self.incongruent_error_rate = incongruent_error_rate
+        self.reading_share = reading_share
+        self.rng = random.Random(seed)
+
+    def respond(self, trial, engine):
+        """
+        返回 (作答选项, 反应时间)
+        """
+        incongruent = trial["type"] == "incongruent"
+        reaction_time = (self.rng.gauss(self.mu, self.sigma) + self.rng.expovariate(1 / self.tau)
+                         + (self.interference if incongruent else 0.0))
+        correct_response = engine.correct_responses.get(trial["color"])
+        if self.rng.random() >= (self.incongruent_error_rate if incongruent else self.error_rate):
+            return correct_response, reaction_time
+        if incongruent and self.rng.random() < self.reading_share:
+            return engine.correct_responses[trial["word"]], reaction_time
+        return self.rng.choice([r for r in engine.responses if r != correct_response]), reaction_time
+
+
+def run_session(engine, responder):
+    """
+    由模拟被试完成一整个会话，返回每个试次的记录
+    """
+    engine.reset()
+    results = []
+    while not engine.finished:
+        response, reaction_time = responder.respond(engine.current(), engine)
+        results.append(engine.respond(response, reaction_time))
+    return results
+
+
+def score_sessions(is_practice, trial_type, correct, reaction_time):
+    """
+    StroopEngine 计分与 StroopStats 统计的向量化版本：对 (会话数, 试次数) 的作答矩阵一次算出全部会话的汇总，
+    trial_type 为每个试次的类型名称（各会话相同的试次布局），correct 中中性试次的值被忽略。
+    返回与 StroopEngine.summary 同名的数组字典
+    """
+    is_practice = np.asarray(is_practice, dtype=bool)
+    trial_type = np.asarray(trial_type)
+    neutral = trial_type == "neutral"
+    correct = np.asarray(correct, dtype=bool) & ~neutral
+    reaction_time = np.asarray(reaction_time, dtype=float)
+
+    def mean(values, mask):
+        count = mask.sum(axis=-1)
+        total = np.where(mask, values, 0.0).sum(axis=-1)
+        return np.divide(total, count, out=np.zeros(total.shape), where=count > 0)
+
+    test = ~is_practice
+    summary = {
+        "practice_accuracy": mean(correct * 100.0, np.broadcast_to(is_practice, correct.shape)),
+        "practice_rt": mean(reaction_time, np.broadcast_to(is_practice, correct.shape)),
+        "test_accuracy": mean(correct * 100.0, np.broadcast_to(test, correct.shape)),
+    }
+    for name in ("congruent", "incongruent", "neutral"):
+        summary[f"{name}_rt"] = mean(reaction_time, correct & test & (trial_type == name))
+    summary["stroop_effect"] = summary["incongruent_rt"] - summary["congruent_rt"]
+    summary["score"] = (np.where(correct, CORRECT_POINTS, ERROR_POINTS) * ~neutral).sum(axis=-1)
+    return summary
+
+
+def simulate_sessions(n_sessions, engine, responder, seed=None, chunk=SIMULATION_CHUNK):
+    """
+    按 responder 的反应时间与错误模型批量模拟 n_sessions 个会话（numpy 向量化，分块进行），
+    试次布局取自 engine 当前的试次序列；汇总统计与计分和顺序无关，因此各会话共用同一顺序。
+    返回与 StroopEngine.summary 同名的数组字典
+    """
+    rng = np.random.default_rng(seed)
+    is_practice = np.array([t["is_practice"] for t in engine.trials])
+    trial_type = np.array([t["type"] for t in engine.trials])
+    incongruent = trial_type == "incongruent"
+    error_rate = np.where(incongruent, responder.incongruent_error_rate, responder.error_rate)
+
+    parts = []
+    for start in range(0, n_sessions, chunk):
+        shape = (min(chunk, n_sessions - start), len(trial_type))
+        reaction_time = (rng.normal(responder.mu, responder.sigma, shape) + rng.exponential(responder.tau, shape)
+                         + responder.interference * incongruent)
+        correct = rng.random(shape) >= error_rate
+        parts.append(score_sessions(is_practice, trial_type, correct, reaction_time))
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+def score_openness_analysis(levels, responders, engine, n_sessions, seed=None):
+    """
+    把模拟得分送入 拟合_score-openness.py 的分析：每个开敞度水平用各自的模拟被试批量运行 n_sessions 个会话，
+    各水平的平均得分按最小、最大值归一化到 0–100（原始数据 S 的尺度）得到 S，再拟合样条 S(O)
+    并换算专注度 F = ((S - 79) / 33.75)³。返回 (S, 样条模型, 各水平上的 F)
+    """
+    raw = np.empty(len(responders))
+    for k, responder in enumerate(responders):
+        scores = simulate_sessions(n_sessions, engine, responder, None if seed is None else seed + k)["score"]
+        raw[k] = scores.mean()
+    span = raw.max() - raw.min()
+    S = (raw - raw.min()) / span * 100 if span > 0 else np.full(len(raw), 50.0)
+    model = fit_model('spline', levels, S)
+    return S, model, score_to_focus(model(levels))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='无界面斯特鲁普任务：模拟被试批量运行，用于基准测试与计分回归检查')
+    parser.add_argument('--sessions', type=int, default=100000, help='批量模拟的会话数')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--check', type=int, default=200, metavar='N',
+                        help='逐试次运行 N 个会话，核对向量化计分与 StroopEngine 的结果是否一致')
+    parser.add_argument('--openness', type=int, default=10000, metavar='N',
+                        help='每个开敞度水平模拟 N 个会话，把平均得分送入得分→开敞度分析（0 为跳过）')
+    args = parser.parse_args()
+
+    words = ["Red", "Green", "Blue", "Yellow", "Purple"]
+    response_map = dict(zip(["红色", "绿色", "蓝色", "黄色", "紫色"], words))
+    engine = StroopEngine(words, response_map, random.Random(args.seed))
+    responder = SimulatedResponder(seed=args.seed)
+
+    if args.check:
+        for _ in range(args.check):
+            results = run_session(engine, responder)
+            expected = engine.summary()
+            batch = score_sessions([r["is_practice"] for r in results], [r["trial_type"] for r in results],
+                                   [[bool(r["is_correct"]) for r in results]], [[r["reaction_time"] for r in results]])
+            for key, value in expected.items():
+                if not np.isclose(batch[key][0], value, rtol=1e-12, atol=1e-12):
+                    raise SystemExit(f"计分不一致：{key} 逐试次 {value} ≠ 向量化 {batch[key][0]}")
+        print(f"{args.check} 个逐试次会话与向量化计分结果一致")
+
+    start = time.perf_counter()
+    summary = simulate_sessions(args.sessions, engine, responder, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"模拟 {args.sessions} 个会话用时 {elapsed:.2f} 秒（{args.sessions / elapsed:.0f} 个/秒）")
+    print(f"  平均得分 {summary['score'].mean():.2f}，正式测试准确率 {summary['test_accuracy'].mean():.2f}%，"
+          f"斯特鲁普效应 {summary['stroop_effect'].mean():.3f}秒")
+
+    if args.openness:
+        # 每个开敞度水平的被试错误率取基准值的随机倍数，使各水平的平均得分不同
+        rng = random.Random(args.seed)
+        responders = []
+        for _ in OPENNESS_LEVELS:
+            factor = rng.uniform(*ERROR_RATE_SPREAD)
+            responders.append(SimulatedResponder(error_rate=responder.error_rate * factor,
+                                                 incongruent_error_rate=responder.incongruent_error_rate * factor))
+        levels = np.array(OPENNESS_LEVELS, dtype=float)
+        S, model, F = score_openness_analysis(levels, responders, engine, args.openness, args.seed)
+        if not (np.allclose(model(levels), S, rtol=1e-12, atol=1e-9) and np.all(np.isfinite(F))):
+            raise SystemExit("得分→开敞度分析结果异常：样条未经过各水平的平均得分，或专注度不是有限值")
+        print(f"得分→开敞度分析（每个水平 {args.openness} 个模拟会话）:")
+        for O, s, f in zip(levels, S, F):
+            print(f"  O={O}%, S={s:.4f}, F={f:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import csv
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+# 试次记录的列（与保存的 CSV 表头一致）
+RESULT_FIELDS = [
+    "trial_number", "word", "display_color", "response_color", "is_correct",
+    "reaction_time", "render_latency", "trial_type", "is_practice", "score"
+]
+
+# 后台线程每批最多写入的试次数，以及两次落盘之间的最长间隔（秒）
+BATCH_SIZE = 20
+FLUSH_INTERVAL = 0.5
+
+
+def session_filename(prefix="stroop_test_results"):
+    # 精确到微秒，同一秒内重新开始的会话也不会与上一个会话重名
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    return f"{prefix}_{timestamp}.csv"
+
+
+class TrialLogger:
+    """
+    试次逐条追加到会话 CSV：log 只把记录放入队列，由后台线程成批写入并落盘（flush + fsync），
+    磁盘写入不会阻塞 Tk 事件循环；程序崩溃时最多丢失最近 FLUSH_INTERVAL 秒内的试次。
+    close 写完队列中剩余的记录并关闭文件
+    """
+
+    def __init__(self, path, fields=RESULT_FIELDS, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.fields = fields
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.error = None
+        self.closed = False
+        self._queue = queue.Queue()
+        # 表头在创建时写入，会话一开始就有合法的文件；
+        # 以 "x" 模式打开，文件已存在时抛出 FileExistsError，而不是截断之前的记录
+        self._file = open(path, "x", encoding="utf-8-sig", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=fields)
+        self._writer.writeheader()
+        self._file.flush()
+        self._thread = threading.Thread(target=self._run, name="TrialLogger", daemon=True)
+        self._thread.start()
+
+    def log(self, row):
+        self._queue.put(row)
+
+    def _run(self):
+        done = False
+        while not done:
+            batch = [self._queue.get()]
+            # 攒够一批或到达刷新间隔再写，减少小写入
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not None:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                batch.pop()
+                done = True
+            try:
+                self._writer.writerows(batch)
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except OSError as e:
+                self.error = e
+
+    def close(self):
+        """
+        写完剩余记录并关闭文件，返回文件路径；写入出错时抛出该错误
+        """
+        if not self.closed:
+            self.closed = True
+            self._queue.put(None)
+            self._thread.join()
+            self._file.close()
+        if self.error is not None:
+            raise self.error
+        return self.path
@@ -0,0 +1,57 @@
+from collections import defaultdict
+
+
+class StroopStats:
+    """
+    斯特鲁普任务统计的累加器：每个试次作答时 O(1) 更新，任何时刻取汇总的代价都与试次数无关。
+    统计口径与原先在结束时逐表计算的相同：
+    练习阶段的平均反应时间包含全部练习试次；按类型的平均反应时间只统计正式测试中回答正确的试次
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        # 按阶段（practice / test）累计的试次数、正确数和反应时间总和
+        self.trials = defaultdict(int)
+        self.correct = defaultdict(int)
+        self.rt_sum = defaultdict(float)
+        # 正式测试中按试次类型累计的正确试次数与反应时间总和
+        self.type_count = defaultdict(int)
+        self.type_rt_sum = defaultdict(float)
+
+    def add(self, is_practice, trial_type, is_correct, reaction_time):
+        phase = "practice" if is_practice else "test"
+        self.trials[phase] += 1
+        self.rt_sum[phase] += reaction_time
+        if is_correct:
+            self.correct[phase] += 1
+            if not is_practice:
+                self.type_count[trial_type] += 1
+                self.type_rt_sum[trial_type] += reaction_time
+
+    def accuracy(self, phase):
+        return self.correct[phase] / self.trials[phase] * 100 if self.trials[phase] else 0
+
+    def mean_rt(self, phase):
+        return self.rt_sum[phase] / self.trials[phase] if self.trials[phase] else 0
+
+    def type_rt(self, trial_type):
+        count = self.type_count[trial_type]
+        return self.type_rt_sum[trial_type] / count if count else 0
+
+    def summary(self):
+        """
+        返回汇总统计；斯特鲁普效应为不一致与一致试次平均反应时间之差
+        """
+        congruent_rt = self.type_rt("congruent")
+        incongruent_rt = self.type_rt("incongruent")
+        return {
+            "practice_accuracy": self.accuracy("practice"),
+            "practice_rt": self.mean_rt("practice"),
+            "test_accuracy": self.accuracy("test"),
+            "congruent_rt": congruent_rt,
+            "incongruent_rt": incongruent_rt,
+            "neutral_rt": self.type_rt("neutral"),
+            "stroop_effect": incongruent_rt - congruent_rt,
+        }
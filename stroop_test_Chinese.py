@@ -1,13 +1,17 @@
+import argparse
 import tkinter as tk
 from tkinter import messagebox, font
-import random
 import time
-import pandas as pd
-from datetime import datetime
+from stroop_log import TrialLogger, session_filename
+from stroop_engine import StroopEngine
+from stroop_timing import EventClock
+
+# 键盘作答模式下默认的按键（按按钮顺序）
+DEFAULT_KEYS = ["1", "2", "3", "4", "5"]
 
 
 class StroopTest:
-    def __init__(self, root):
+    def __init__(self, root, keys=None):
         self.root = root
         self.root.title("斯特鲁普任务测试")
         self.root.geometry("800x600")
@@ -36,20 +40,47 @@ class StroopTest:
             "紫": "#800080"
         }
 
+        # 按钮选项 → 颜色词
+        self.response_map = {
+            "红色": "红",
+            "绿色": "绿",
+            "蓝色": "蓝",
+            "黄色": "黄",
+            "紫色": "紫"
+        }
+
+        # 试次序列、判分（+1/−5）与统计由无界面的引擎完成
+        self.engine = StroopEngine(self.english_colors, self.response_map)
+
         # 测试状态
-        self.trials = []
-        self.current_trial = 0
         self.start_time = 0
+        self.render_latency = 0
         self.test_started = False
-        self.results = []
-        self.score = 0  # 新增：当前得分
+        self.logger = None  # 当前会话的试次日志
+
+        # 键盘作答模式：按键（Tk keysym）→ 按钮选项，按按钮顺序对应；为 None 时用鼠标点击作答
+        self.key_map = dict(zip(keys, self.colors)) if keys else None
+        self.event_clock = EventClock()
+        self.held_keys = set()  # 当前按住未松开的按键
+        self.release_times = {}  # 各按键最近一次松开的事件时间戳
 
         # 创建界面
         self.create_widgets()
 
+        if self.key_map:
+            for key, button in zip(keys, self.color_buttons):
+                button.config(text=f"{button['text']} ({key})")
+            # 按键的反应时刻取事件自身的时间戳；鼠标移动事件用于持续校准事件时钟
+            self.root.bind_all("<KeyPress>", self.on_key_press)
+            self.root.bind_all("<KeyRelease>", self.on_key_release)
+            self.root.bind_all("<Motion>", lambda event: self.event_clock.observe(event.time), add="+")
+
         # 生成测试序列
         self.generate_trials()
 
+        # 关闭窗口时写完日志中尚未落盘的试次
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
     def create_widgets(self):
         # 欢迎页
         self.welcome_frame = tk.Frame(self.root, bg="#f0f0f0")
@@ -200,73 +231,20 @@ class StroopTest:
         self.restart_btn.pack(pady=10)
 
     def generate_trials(self):
-        # 生成练习试次：10个一致和10个不一致
-        practice_trials = []
-        for _ in range(5):
-            for word in self.english_colors:
-                # 一致试次
-                practice_trials.append({
-                    "word": word,
-                    "color": word,
-                    "type": "congruent",
-                    "is_practice": True
-                })
-                # 不一致试次（随机选择不同颜色）
-                colors = [c for c in self.english_colors if c != word]
-                color = random.choice(colors)
-                practice_trials.append({
-                    "word": word,
-                    "color": color,
-                    "type": "incongruent",
-                    "is_practice": True
-                })
-
-        # 生成正式试次：每种类型20个
-        trials = []
-        for _ in range(20):
-            for word in self.english_colors:
-                # 一致试次
-                trials.append({
-                    "word": word,
-                    "color": word,
-                    "type": "congruent",
-                    "is_practice": False
-                })
-                # 不一致试次
-                colors = [c for c in self.english_colors if c != word]
-                color = random.choice(colors)
-                trials.append({
-                    "word": word,
-                    "color": color,
-                    "type": "incongruent",
-                    "is_practice": False
-                })
-                # 中性试次（用黑色显示颜色词）
-                # trials.append({
-                #     "word": word,
-                #     "color": "Black",
-                #     "type": "neutral",
-                #     "is_practice": False
-                # })
-
-        # 随机打乱试次顺序
-        random.shuffle(practice_trials)
-        random.shuffle(trials)
-
-        # 合并试次，练习在前，正式在后
-        self.trials = practice_trials + trials
+        # 生成新的试次序列（练习在前，正式在后），得分与统计清零
+        self.engine.reset()
 
     def start_practice(self):
         self.welcome_frame.pack_forget()
         self.test_frame.pack(fill=tk.BOTH, expand=True)
-        self.current_trial = 0
         self.test_started = True
+        # 每次会话开始即创建日志文件，试次作答后立即追加
+        self.logger = TrialLogger(session_filename())
         self.show_trial()
 
     def show_trial(self):
-        if self.current_trial < len(self.trials):
-            trial = self.trials[self.current_trial]
-
+        trial = self.engine.current()
+        if trial is not None:
             # 显示注视点
             # self.word_label.config(text="+", fg="black")
             # self.root.update()
@@ -278,55 +256,49 @@ class StroopTest:
             else:
                 color_code = self.english_color_codes[trial["color"]]
 
+            # 刺激呈现时刻：update_idletasks 让 Tk 立即完成重绘并提交给窗口系统后再计时，
+            # 用单调高精度时钟 perf_counter，config→重绘完成的耗时记为显示延迟
+            config_time = time.perf_counter()
             self.word_label.config(text=trial["word"], fg=color_code)
-            self.start_time = time.time()
+            self.root.update_idletasks()
+            self.start_time = time.perf_counter()
+            self.render_latency = self.start_time - config_time
         else:
             self.end_test()
 
-    def on_color_click(self, selected_color):
+    def on_key_press(self, event):
+        response_time = self.event_clock.to_perf_counter(event.time)
+        # 按住不放产生的自动重复不算作答，须松开后重新按下：Windows/macOS 只重复 KeyPress，
+        # X11 则在每次重复前先产生一个时间戳相同的 KeyRelease
+        repeat = event.keysym in self.held_keys or self.release_times.get(event.keysym) == event.time
+        self.held_keys.add(event.keysym)
+        if repeat:
+            return
+        selected_color = self.key_map.get(event.keysym)
+        # 按键发生在本试次刺激呈现之前（如事件循环繁忙时积压的按键），不作为本试次的作答
+        if selected_color is None or response_time < self.start_time:
+            return
+        self.on_color_click(selected_color, response_time)
+
+    def on_key_release(self, event):
+        self.event_clock.observe(event.time)
+        self.held_keys.discard(event.keysym)
+        self.release_times[event.keysym] = event.time
+
+    def on_color_click(self, selected_color, end_time=None):
         if not self.test_started:
             return
 
-        end_time = time.time()
+        # 鼠标作答在回调中计时；键盘作答传入按键事件发生的时刻
+        if end_time is None:
+            end_time = time.perf_counter()
         reaction_time = end_time - self.start_time
-        trial = self.trials[self.current_trial]
 
-        # 记录结果
-        correct = False
-        if trial["color"] == "Black":
-            # 中性试次不计分
-            correct = None
-        else:
-            # 检查回答是否正确
-            english_color_map = {
-                "红色": "红",
-                "绿色": "绿",
-                "蓝色": "蓝",
-                "黄色": "黄",
-                "紫色": "紫"
-            }
-            correct = (english_color_map[selected_color] == trial["color"])
-
-            # 新增：计分逻辑
-            if correct:
-                self.score += 1
-            else:
-                self.score -= 5
-
-        self.results.append({
-            "trial_number": self.current_trial + 1,
-            "word": trial["word"],
-            "display_color": trial["color"],
-            "response_color": selected_color,
-            "is_correct": correct,
-            "reaction_time": reaction_time,
-            "trial_type": trial["type"],
-            "is_practice": trial["is_practice"],
-            "score": self.score  # 新增：记录当前得分
-        })
+        # 判分与统计由引擎完成，返回的试次记录直接写入日志
+        result = self.engine.respond(selected_color, reaction_time, self.render_latency)
+        self.logger.log(result)
 
         # 直接进入下一个试次，不显示反馈
-        self.current_trial += 1
         self.show_trial()
 
     def stop_test(self):
@@ -338,53 +310,28 @@ class StroopTest:
         self.test_frame.pack_forget()
         self.results_frame.pack(fill=tk.BOTH, expand=True)
 
-        # 计算结果统计
-        practice_results = [r for r in self.results if r["is_practice"]]
-        test_results = [r for r in self.results if not r["is_practice"]]
-
-        # 练习阶段统计
-        practice_correct = [r for r in practice_results if r["is_correct"]]
-        practice_accuracy = len(practice_correct) / len(practice_results) * 100 if practice_results else 0
-        practice_rt = sum(r["reaction_time"] for r in practice_results) / len(
-            practice_results) if practice_results else 0
-
-        # 测试阶段统计
-        test_correct = [r for r in test_results if r["is_correct"]]
-        test_accuracy = len(test_correct) / len(test_results) * 100 if test_results else 0
-
-        # 按类型分类统计
-        congruent_trials = [r for r in test_results if r["trial_type"] == "congruent" and r["is_correct"]]
-        incongruent_trials = [r for r in test_results if r["trial_type"] == "incongruent" and r["is_correct"]]
-        neutral_trials = [r for r in test_results if r["trial_type"] == "neutral" and r["is_correct"]]
-
-        congruent_rt = sum(r["reaction_time"] for r in congruent_trials) / len(
-            congruent_trials) if congruent_trials else 0
-        incongruent_rt = sum(r["reaction_time"] for r in incongruent_trials) / len(
-            incongruent_trials) if incongruent_trials else 0
-        neutral_rt = sum(r["reaction_time"] for r in neutral_trials) / len(neutral_trials) if neutral_trials else 0
-
-        # 计算斯特鲁普效应
-        stroop_effect = incongruent_rt - congruent_rt
+        # 统计已在每次作答时累加，汇总的代价与试次数无关
+        stats = self.engine.summary()
 
         # 显示结果
         result_text = f"""
         测试完成！
 
-        最终得分: {self.score}
+        最终得分: {stats['score']}
 
         练习阶段:
-          准确率: {practice_accuracy:.2f}%
-          平均反应时间: {practice_rt:.2f}秒
+          准确率: {stats['practice_accuracy']:.2f}%
+          平均反应时间: {stats['practice_rt']:.2f}秒
 
         正式测试:
-          总体准确率: {test_accuracy:.2f}%
+          总体准确率: {stats['test_accuracy']:.2f}%
 
         按类型分类的平均反应时间:
-          - 一致试次: {congruent_rt:.2f}秒
-          - 不一致试次: {incongruent_rt:.2f}秒
-          - 中性试次: {neutral_rt:.2f}秒
+          - 一致试次: {stats['congruent_rt']:.2f}秒
+          - 不一致试次: {stats['incongruent_rt']:.2f}秒
+          - 中性试次: {stats['neutral_rt']:.2f}秒
 
-        斯特鲁普效应: {stroop_effect:.2f}秒
+        斯特鲁普效应: {stats['stroop_effect']:.2f}秒
 
         斯特鲁普效应反映了不一致试次和一致试次之间的反应时间差异。
         差异越大，表明语义干扰对颜色判断的影响越强。
@@ -396,27 +343,35 @@ class StroopTest:
         self.results_text.config(state=tk.DISABLED)
 
     def save_results(self):
+        # 试次在作答时已逐条写入日志，这里只需写完剩余记录并关闭文件
         try:
-            # 创建数据框
-            df = pd.DataFrame(self.results)
-
-            # 保存为CSV文件
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"stroop_test_results_{timestamp}.csv"
-            df.to_csv(filename, index=False, encoding="utf-8-sig")
-
+            filename = self.close_logger()
             messagebox.showinfo("成功", f"结果已保存至 {filename}")
         except Exception as e:
             messagebox.showerror("错误", f"保存结果时出错: {str(e)}")
 
+    def close_logger(self):
+        if self.logger is None:
+            return None
+        return self.logger.close()
+
+    def on_close(self):
+        try:
+            self.close_logger()
+        finally:
+            self.root.destroy()
+
     def restart_test(self):
+        # 未保存的会话日志同样写完并关闭
+        try:
+            self.close_logger()
+        except OSError as e:
+            messagebox.showerror("错误", f"保存结果时出错: {str(e)}")
+        self.logger = None
+
         # 重置测试状态
-        self.trials = []
-        self.current_trial = 0
         self.start_time = 0
         self.test_started = False
-        self.results = []
-        self.score = 0
 
         # 生成新的测试序列
         self.generate_trials()
@@ -427,6 +382,12 @@ class StroopTest:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="斯特鲁普任务测试")
+    parser.add_argument("--keyboard", action="store_true", help="键盘作答模式：以按键事件的时间戳作为反应时刻")
+    parser.add_argument("--keys", nargs=5, default=DEFAULT_KEYS, metavar="KEY",
+                        help="键盘模式下按按钮顺序对应的按键（Tk keysym），默认 1 2 3 4 5")
+    args = parser.parse_args()
+
     root = tk.Tk()
-    app = StroopTest(root)
+    app = StroopTest(root, args.keys if args.keyboard else None)
     root.mainloop()
\ No newline at end of file
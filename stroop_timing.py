@@ -0,0 +1,55 @@
+import time
+
+# Tk 事件时间戳为窗口系统的 32 位毫秒计数，约 49.7 天回绕一次
+EVENT_TIME_WRAP = 2 ** 32
+
+# 允许两个时钟之间的相对漂移（秒/秒），偏移量的估计每秒最多向上放宽这么多
+MAX_DRIFT = 1e-4
+
+
+class EventClock:
+    """
+    把 Tk 事件自带的时间戳（event.time，事件在窗口系统中发生的时刻）换算到 time.perf_counter 的时间轴上。
+    每个事件都给出一个偏移量候选 perf_counter() − event.time：事件循环忙时处理得越晚，候选值越大，
+    因此取见过的最小值即最接近真实偏移量的估计，事件循环短暂繁忙也不会使换算结果变晚。
+    频繁到达的鼠标移动、按键事件都可以喂给 observe 以持续校准
+    """
+
+    def __init__(self, max_drift=MAX_DRIFT):
+        self.max_drift = max_drift
+        self.offset = None
+        self.last_now = None
+        self.last_event_time = None
+        self.wraps = 0
+
+    def unwrap(self, event_time):
+        """
+        把 32 位回绕的毫秒计数展开为单调的秒数
+        """
+        event_time &= EVENT_TIME_WRAP - 1
+        # 事件可能轻微乱序，只有大幅倒退才视为回绕
+        if self.last_event_time is not None and event_time < self.last_event_time - EVENT_TIME_WRAP // 2:
+            self.wraps += 1
+        self.last_event_time = event_time
+        return (event_time + self.wraps * EVENT_TIME_WRAP) / 1000
+
+    def observe(self, event_time):
+        """
+        用一个刚收到的事件校准偏移量，返回该事件展开后的时间戳（秒）
+        """
+        now = time.perf_counter()
+        seconds = self.unwrap(event_time)
+        candidate = now - seconds
+        if self.offset is None:
+            self.offset = candidate
+        else:
+            # 最小值滤波；按经过的时间略微放宽，以跟随两个时钟之间的缓慢漂移
+            self.offset = min(candidate, self.offset + self.max_drift * (now - self.last_now))
+        self.last_now = now
+        return seconds
+
+    def to_perf_counter(self, event_time):
+        """
+        返回事件发生时刻在 perf_counter 时间轴上的值（同时用该事件校准）
+        """
+        return self.observe(event_time) + self.offset
@@ -0,0 +1,138 @@
+import argparse
+import math
+import os
+
+import numpy as np
+
+from 头部姿态计算 import MIN_CONFIDENCE
+from 面部姿态提取 import (CHUNK_SIZE, TIMESTAMP_SCALE, NpyAppender, array_paths, load_arrays, load_frame_times,
+                    timestamps_path)
+
+# One-Euro 滤波参数：静止时的截止频率（Hz）、速度系数、速度估计的截止频率（Hz）
+MIN_CUTOFF = 1.0
+BETA = 0.007
+D_CUTOFF = 1.0
+
+# 置信度达到该值的观测权重为 1，介于 MIN_CONFIDENCE 与该值之间按比例降权
+FULL_CONFIDENCE = 1.0
+
+FPS = 30.0
+
+
+def smoothing_factor(dt, cutoff):
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+def confidence_weight(confidence, min_confidence=MIN_CONFIDENCE, full_confidence=FULL_CONFIDENCE):
+    """
+    置信度 → 观测权重：低于 min_confidence（或缺失）为 0，即丢弃该观测；否则为 confidence / full_confidence，最大为 1
+    """
+    confidence = np.asarray(confidence, dtype=float)
+    weight = np.minimum(confidence / full_confidence, 1.0)
+    return np.where(confidence >= min_confidence, weight, 0.0)
+
+
+class OneEuroFilter:
+    """
+    按置信度加权的 One-Euro 关键点滤波器，对一帧内的全部关键点做向量化更新。
+    权重为 0 的关键点保持上一次的估计值；首个有效观测之前输出 NaN。
+    step 用于实时逐帧滤波，filter 用于存档批量滤波，两者共用同一更新过程，结果完全一致。
+    """
+
+    def __init__(self, min_cutoff=MIN_CUTOFF, beta=BETA, d_cutoff=D_CUTOFF,
+                 min_confidence=MIN_CONFIDENCE, full_confidence=FULL_CONFIDENCE):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.min_confidence = min_confidence
+        self.full_confidence = full_confidence
+        self.reset()
+
+    def reset(self):
+        self.value = None  # 当前估计 (关键点, 维度)
+        self.speed = None  # 速度估计 (关键点, 维度)
+        self.last_t = None
+
+    def step(self, t, keypoints, confidence=None):
+        """
+        输入时刻 t（秒）的一帧关键点 (关键点, 维度) 及置信度 (关键点,)，返回滤波后的关键点
+        """
+        x = np.asarray(keypoints, dtype=float)
+        if confidence is None:
+            weight = np.ones(x.shape[:-1])
+        else:
+            weight = confidence_weight(confidence, self.min_confidence, self.full_confidence)
+        weight = np.where(np.isnan(x).any(axis=-1), 0.0, weight)[..., None]
+
+        if self.value is None:
+            self.value = np.full(x.shape, np.nan)
+            self.speed = np.zeros(x.shape)
+        dt = t - self.last_t if self.last_t is not None else 0.0
+        self.last_t = t
+
+        # 首次观测到的关键点直接取观测值
+        new = np.isnan(self.value) & (weight > 0)
+        self.value[new] = x[new]
+        update = ~new & (weight > 0)
+        if dt > 0 and update.any():
+            alpha_d = smoothing_factor(dt, self.d_cutoff) * weight
+            speed = self.speed + alpha_d * ((x - self.value) / dt - self.speed)
+            self.speed = np.where(update, speed, self.speed)
+            alpha = smoothing_factor(dt, self.min_cutoff + self.beta * np.abs(self.speed)) * weight
+            self.value = np.where(update, self.value + alpha * (x - self.value), self.value)
+        return self.value.copy()
+
+    def filter(self, timestamps, keypoints, confidence=None):
+        """
+        批量滤波：keypoints 为 (帧, 关键点, 维度)，confidence 为 (帧, 关键点)，返回同形状的滤波结果。
+        状态在调用之间保留，因此可以分块处理任意长的存档。
+        """
+        keypoints = np.asarray(keypoints, dtype=float)
+        output = np.empty(keypoints.shape)
+        for i, t in enumerate(np.asarray(timestamps, dtype=float)):
+            output[i] = self.step(t, keypoints[i], None if confidence is None else confidence[i])
+        return output
+
+
+def filter_arrays(prefix, output_prefix, fps=FPS, chunksize=CHUNK_SIZE, timestamp_scale=TIMESTAMP_SCALE, **kwargs):
+    """
+    分块滤波 面部姿态提取.py --npy 的输出，写出 <output_prefix>_keypoints.npy，置信度与时间戳原样复制。
+    滤波的时间间隔取自 <prefix>_timestamps.npy 的采集时刻，没有该文件时按 fps 推算
+    """
+    keypoints, confidence = load_arrays(prefix)
+    times = load_frame_times(prefix, len(keypoints), fps, timestamp_scale)
+    smoother = OneEuroFilter(**kwargs)
+    keypoints_path, confidence_path = array_paths(output_prefix)
+    with NpyAppender(keypoints_path, keypoints.shape[1:]) as kp_writer, \
+            NpyAppender(confidence_path, confidence.shape[1:]) as conf_writer:
+        for start in range(0, len(keypoints), chunksize):
+            stop = min(start + chunksize, len(keypoints))
+            kp_writer.append(smoother.filter(times[start:stop], keypoints[start:stop], confidence[start:stop]))
+            conf_writer.append(confidence[start:stop])
+    if os.path.exists(timestamps_path(prefix)):
+        np.save(timestamps_path(output_prefix), np.load(timestamps_path(prefix)))
+    return kp_writer.frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description='按置信度加权的 One-Euro 关键点平滑')
+    parser.add_argument('prefix', help='面部姿态提取.py --npy 输出的数组前缀')
+    parser.add_argument('-o', '--output', default='filtered', help='输出数组前缀')
+    parser.add_argument('--fps', type=float, default=FPS, help='捕获帧率，用于补齐缺失的时间戳（没有时间戳数组时按帧率推算）')
+    parser.add_argument('--timestamp-scale', type=float, default=TIMESTAMP_SCALE,
+                        help='捕获文件第一列时间戳换算为秒的系数（默认为毫秒）')
+    parser.add_argument('--min-cutoff', type=float, default=MIN_CUTOFF, help='静止时的截止频率（Hz）')
+    parser.add_argument('--beta', type=float, default=BETA, help='速度系数，越大对快速运动的跟随越紧')
+    parser.add_argument('--min-confidence', type=float, default=MIN_CONFIDENCE, help='低于该置信度的观测被丢弃')
+    parser.add_argument('--full-confidence', type=float, default=FULL_CONFIDENCE, help='达到该置信度的观测权重为 1')
+    args = parser.parse_args()
+
+    frames = filter_arrays(args.prefix, args.output, args.fps, timestamp_scale=args.timestamp_scale,
+                           min_cutoff=args.min_cutoff, beta=args.beta,
+                           min_confidence=args.min_confidence, full_confidence=args.full_confidence)
+    print(f"已滤波 {frames} 帧，结果保存至 {' / '.join(array_paths(args.output))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import argparse
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from 拟合模型库 import dataset_stem, expand_datasets, fit_model, load_dataset, load_model, save_model
+
+# 每个参与者默认拟合并保存的模型
+STORE_MODELS = ('poly4', 'spline')
+
+# 运行时默认使用的模型
+DEFAULT_MODEL = 'spline'
+
+# LRU 缓存中最多同时保留的模型数
+CACHE_SIZE = 64
+
+# 模型库的索引文件名
+INDEX_NAME = 'index.json'
+
+
+def _fit_participant(job):
+    path, names, store_dir = job
+    participant = dataset_stem(path)
+    x, y = load_dataset(path)
+    entries = {}
+    for name in names:
+        model = fit_model(name, x, y)
+        filename = f"{participant}_{name}.npz"
+        save_model(model, os.path.join(store_dir, filename))
+        entries[name] = {'file': filename, 'r2': model.r2, 'rmse': model.rmse}
+    return participant, entries
+
+
+def check_participant_ids(paths):
+    """
+    参与者 ID 取自文件名，不同目录下的同名数据集会互相覆盖模型文件与索引条目；有重复时抛出 ValueError
+    """
+    owners = {}
+    for path in paths:
+        participant = dataset_stem(path)
+        if participant in owners:
+            raise ValueError(f"参与者 ID 重复：{participant}（{owners[participant]} 与 {path}）")
+        owners[participant] = path
+
+
+def build_store(paths, store_dir, names=STORE_MODELS, workers=None):
+    """
+    用进程池并行拟合每个参与者的数据集（参与者 ID 为文件名），模型保存为 npz，
+    并写入索引 {participant: {model: {file, r2, rmse}}}；已有索引中的其他参与者保留。
+    同一批中参与者 ID 重复时抛出 ValueError，不写入任何文件
+    """
+    check_participant_ids(paths)
+    os.makedirs(store_dir, exist_ok=True)
+    index_path = os.path.join(store_dir, INDEX_NAME)
+    index = {}
+    if os.path.exists(index_path):
+        with open(index_path, encoding='utf-8') as f:
+            index = json.load(f)
+
+    jobs = [(path, tuple(names), store_dir) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for participant, entries in pool.map(_fit_participant, jobs, chunksize=8):
+            index.setdefault(participant, {}).update(entries)
+
+    # 先写临时文件再替换，运行中的工作站不会读到写了一半的索引
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, index_path)
+    return index
+
+
+class ParticipantModelStore:
+    """
+    按参与者 ID 读取个性化模型：索引在打开时一次读入，模型文件按需加载，
+    并保存在容量有限的 LRU 缓存中（OrderedDict，最近使用的在末尾）
+    """
+
+    def __init__(self, store_dir, cache_size=CACHE_SIZE):
+        self.store_dir = store_dir
+        self.cache_size = cache_size
+        with open(os.path.join(store_dir, INDEX_NAME), encoding='utf-8') as f:
+            self.index = json.load(f)
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, participant):
+        return participant in self.index
+
+    def participants(self):
+        return sorted(self.index)
+
+    def get(self, participant, name=DEFAULT_MODEL):
+        """
+        返回参与者的 FittedModel；未知的参与者或模型抛出 KeyError
+        """
+        key = (participant, name)
+        model = self.cache.get(key)
+        if model is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return model
+
+        entry = self.index[participant][name]
+        model = load_model(os.path.join(self.store_dir, entry['file']))
+        self.misses += 1
+        self.cache[key] = model
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description='按参与者建立个性化开敞度模型库，运行时经 LRU 缓存读取')
+    parser.add_argument('datasets', nargs='*', help='各参与者的两列 CSV 数据集，或包含这些 CSV 的目录（文件名即参与者 ID）')
+    parser.add_argument('-o', '--store', default='participant_models', help='模型库目录')
+    parser.add_argument('--models', nargs='+', default=list(STORE_MODELS), help='每个参与者拟合的模型名称')
+    parser.add_argument('--workers', type=int, default=None, help='并行进程数')
+    parser.add_argument('--query', nargs='+', metavar='PARTICIPANT', help='查询参与者的模型（不建库）')
+    parser.add_argument('--model', default=DEFAULT_MODEL, help='查询时使用的模型名称')
+    args = parser.parse_args()
+
+    if args.query:
+        store = ParticipantModelStore(args.store)
+        for participant in args.query:
+            try:
+                model = store.get(participant, args.model)
+            except KeyError:
+                print(f"{participant}: 模型库中没有该参与者的 {args.model} 模型")
+                continue
+            print(f"{participant}: {model}")
+        return
+
+    paths = expand_datasets(args.datasets)
+    if not paths:
+        parser.error("请指定数据集或使用 --query")
+    try:
+        check_participant_ids(paths)
+    except ValueError as e:
+        parser.error(str(e))
+    index = build_store(paths, args.store, args.models, args.workers)
+    print(f"已拟合 {len(paths)} 个参与者，模型库共 {len(index)} 个参与者 → {args.store}")
+
+
+if __name__ == "__main__":
+    main()
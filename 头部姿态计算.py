@@ -0,0 +1,71 @@
+import argparse
+
+import numpy as np
+
+from 面部姿态提取 import load_arrays
+
+# 头部、鼻尖、左耳的关键点索引（即 面部1、面部2、面部3）
+HEAD, NOSE, EAR_LEFT = 26, 27, 29
+
+# 置信度低于该值的关键点视为缺失
+MIN_CONFIDENCE = 0.5
+
+# 输出数组各列的含义
+POSE_COLUMNS = ('yaw', 'pitch', 'roll', 'displacement')
+
+
+def head_pose(keypoints, confidence=None, min_confidence=MIN_CONFIDENCE, reference=None,
+              indices=(HEAD, NOSE, EAR_LEFT)):
+    """
+    由头部、鼻尖、左耳三个关键点对所有帧一次性计算头部姿态，返回 (yaw, pitch, roll, displacement)
+
+    keypoints 形状为 (帧, 关键点, 维度)，坐标系为 x 向右、y 向下、z 指向前方（远离相机）。
+    yaw/pitch 取自头部→鼻尖方向，roll 取自左耳→头部方向，单位为度；
+    displacement 为头部相对 reference 的距离，reference 默认取有效帧头部位置的中位数。
+    任一关键点缺失（NaN）或置信度低于 min_confidence 的帧，结果为 NaN。
+    """
+    points = np.asarray(keypoints)[:, list(indices)].astype(np.float64)
+    if points.shape[2] < 3:
+        raise ValueError("头部姿态需要三维关键点")
+    points = points[:, :, :3]
+    if confidence is not None:
+        confident = np.asarray(confidence)[:, list(indices)] >= min_confidence
+        points[~confident] = np.nan
+
+    head, nose, ear = points[:, 0], points[:, 1], points[:, 2]
+    forward = nose - head
+    lateral = head - ear
+
+    # 正对相机时头部→鼻尖指向 -z，此时 yaw = pitch = 0
+    yaw = np.degrees(np.arctan2(forward[:, 0], -forward[:, 2]))
+    pitch = np.degrees(np.arctan2(-forward[:, 1], np.hypot(forward[:, 0], forward[:, 2])))
+    roll = np.degrees(np.arctan2(lateral[:, 1], np.hypot(lateral[:, 0], lateral[:, 2])))
+
+    if reference is None:
+        valid = ~np.isnan(yaw) & ~np.isnan(roll)
+        reference = np.median(head[valid], axis=0) if valid.any() else np.zeros(3)
+    displacement = np.linalg.norm(head - reference, axis=1)
+    displacement[np.isnan(yaw) | np.isnan(roll)] = np.nan
+    return yaw, pitch, roll, displacement
+
+
+def main():
+    parser = argparse.ArgumentParser(description='由面部关键点数组批量计算头部姿态')
+    parser.add_argument('prefix', help='面部姿态提取.py --npy 输出的数组前缀')
+    parser.add_argument('-o', '--output', default='head_pose.npy',
+                        help='输出 (帧, 4) 数组，各列依次为 yaw、pitch、roll、displacement')
+    parser.add_argument('--min-confidence', type=float, default=MIN_CONFIDENCE, help='关键点最低置信度')
+    args = parser.parse_args()
+
+    keypoints, confidence = load_arrays(args.prefix)
+    pose = np.column_stack(head_pose(keypoints, confidence, args.min_confidence)).astype(np.float32)
+    np.save(args.output, pose)
+
+    valid = ~np.isnan(pose[:, 0])
+    print(f"共 {len(pose)} 帧，有效 {valid.sum()} 帧，结果保存至 {args.output}")
+    for column, values in zip(POSE_COLUMNS, pose[valid].T):
+        print(f"  {column}: 均值 {values.mean():.4f}，标准差 {values.std():.4f}")
+
+
+if __name__ == "__main__":
+    main()
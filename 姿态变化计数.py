@@ -0,0 +1,172 @@
+import argparse
+import json
+import math
+import sys
+from collections import deque
+
+import numpy as np
+
+from 关键点滤波 import OneEuroFilter
+from 头部姿态计算 import HEAD, MIN_CONFIDENCE, head_pose
+from 面部姿态提取 import TIMESTAMP_SCALE, follow_capture, frame_times
+
+# 滑动窗口长度（秒）
+WINDOW = 60.0
+
+# 判定为一次姿态变化的阈值：任一角度变化超过 ANGLE_THRESHOLD 度，或位移变化超过 DISPLACEMENT_THRESHOLD
+ANGLE_THRESHOLD = 10.0
+DISPLACEMENT_THRESHOLD = 0.03
+
+# 捕获行没有可用时间戳（或离线模式未提供时间戳数组）时按此帧率推算
+FPS = 30.0
+
+
+def angle_difference(a, b):
+    # 角度差归一化到 [-180, 180)，避免 yaw 在 ±180° 附近跳变被误判
+    return (a - b + 180.0) % 360.0 - 180.0
+
+
+class PostureChangeCounter:
+    """
+    在线姿态变化计数器：姿态相对上一次稳定姿态超过阈值即记为一次变化，
+    并统计最近 window 秒内的变化次数。每帧更新为均摊 O(1)。
+    """
+
+    def __init__(self, window=WINDOW, angle_threshold=ANGLE_THRESHOLD,
+                 displacement_threshold=DISPLACEMENT_THRESHOLD):
+        self.window = window
+        self.angle_threshold = angle_threshold
+        self.displacement_threshold = displacement_threshold
+        self.anchor = None  # 上一次稳定姿态 (yaw, pitch, roll, displacement)
+        self.events = deque()  # 窗口内各次变化的时间戳
+
+    def update(self, t, yaw, pitch, roll, displacement):
+        """
+        输入时刻 t（秒）的一帧姿态，返回最近 window 秒内的变化次数；姿态缺失（NaN）的帧只推进窗口
+        """
+        if not any(math.isnan(v) for v in (yaw, pitch, roll, displacement)):
+            if self.anchor is None:
+                self.anchor = (yaw, pitch, roll, displacement)
+            elif self._changed(yaw, pitch, roll, displacement):
+                self.events.append(t)
+                self.anchor = (yaw, pitch, roll, displacement)
+        while self.events and self.events[0] <= t - self.window:
+            self.events.popleft()
+        return len(self.events)
+
+    def _changed(self, yaw, pitch, roll, displacement):
+        anchor_yaw, anchor_pitch, anchor_roll, anchor_displacement = self.anchor
+        return (abs(angle_difference(yaw, anchor_yaw)) > self.angle_threshold
+                or abs(angle_difference(pitch, anchor_pitch)) > self.angle_threshold
+                or abs(angle_difference(roll, anchor_roll)) > self.angle_threshold
+                or abs(displacement - anchor_displacement) > self.displacement_threshold)
+
+    @property
+    def count(self):
+        return len(self.events)
+
+    def reset(self):
+        self.anchor = None
+        self.events.clear()
+
+
+def count_changes(timestamps, yaw, pitch, roll, displacement, **kwargs):
+    """
+    离线计数：对存档中的每一帧返回截至该帧、最近 window 秒内的变化次数；
+    timestamps 取 面部姿态提取.py --npy 写出的采集时刻（见 frame_times）时与在线计数结果一致
+    """
+    counter = PostureChangeCounter(**kwargs)
+    columns = (np.asarray(timestamps, dtype=float).tolist(), np.asarray(yaw, dtype=float).tolist(),
+               np.asarray(pitch, dtype=float).tolist(), np.asarray(roll, dtype=float).tolist(),
+               np.asarray(displacement, dtype=float).tolist())
+    return np.fromiter((counter.update(*frame) for frame in zip(*columns)),
+                       dtype=np.int64, count=len(columns[0]))
+
+
+def capture_time(row, previous, fps=FPS, timestamp_scale=TIMESTAMP_SCALE):
+    """
+    捕获行的采集时刻（秒）：取第一列的时间戳；缺失或无法解析时按帧率接在上一帧之后
+    """
+    try:
+        return float(row[0]) * timestamp_scale
+    except (IndexError, ValueError):
+        return 0.0 if previous is None else previous + 1 / fps
+
+
+def follow_changes(input_path, checkpoint_path=None, min_confidence=MIN_CONFIDENCE, smooth=False,
+                   fps=FPS, timestamp_scale=TIMESTAMP_SCALE, **kwargs):
+    """
+    在线计数：跟踪不断追加的捕获文件，逐帧计算头部姿态并产出 (t, 变化次数)
+    t 为捕获行自身的采集时刻而不是处理时刻，因此回放积压数据或从检查点续跑时窗口统计同样正确；
+    smooth 为 True 时先用 One-Euro 滤波器平滑关键点，抑制低置信度检测的抖动
+    """
+    counter = PostureChangeCounter(**kwargs)
+    smoother = OneEuroFilter(min_confidence=min_confidence) if smooth else None
+    reference = None  # 以首个有效帧的头部位置作为位移参考
+    t = None
+    for row, keypoints, confidence in follow_capture(input_path, checkpoint_path):
+        t = capture_time(row, t, fps, timestamp_scale)
+        if keypoints is None:
+            yield t, counter.update(t, math.nan, math.nan, math.nan, math.nan)
+            continue
+        frame = np.asarray([keypoints], dtype=float)
+        frame_confidence = None if confidence is None else np.asarray([confidence], dtype=float)
+        try:
+            if smoother is not None:
+                frame[0] = smoother.step(t, frame[0], None if confidence is None else frame_confidence[0])
+            yaw, pitch, roll, displacement = head_pose(frame, frame_confidence, min_confidence, reference)
+        except (IndexError, ValueError):
+            yield t, counter.update(t, math.nan, math.nan, math.nan, math.nan)
+            continue
+        if reference is None and not np.isnan(displacement[0]):
+            reference = frame[0, HEAD, :3]
+        yield t, counter.update(t, yaw[0], pitch[0], roll[0], displacement[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='由头部姿态统计滑动窗口内的姿态变化次数')
+    parser.add_argument('input', help='头部姿态计算.py 输出的 (帧, 4) 数组；--follow 时为捕获 CSV')
+    parser.add_argument('-o', '--output', default='posture_changes.npy', help='离线模式下每帧变化次数的输出路径')
+    parser.add_argument('--timestamps', metavar='NPY',
+                        help='离线模式下每帧的原始时间戳（面部姿态提取.py --npy 输出的 PREFIX_timestamps.npy）')
+    parser.add_argument('--fps', type=float, default=FPS, help='帧率，用于补齐缺失的时间戳（离线模式未给出 --timestamps 时按帧率推算）')
+    parser.add_argument('--timestamp-scale', type=float, default=TIMESTAMP_SCALE,
+                        help='捕获文件第一列时间戳换算为秒的系数（默认为毫秒）')
+    parser.add_argument('--window', type=float, default=WINDOW, help='滑动窗口长度（秒）')
+    parser.add_argument('--angle-threshold', type=float, default=ANGLE_THRESHOLD, help='角度变化阈值（度）')
+    parser.add_argument('--displacement-threshold', type=float, default=DISPLACEMENT_THRESHOLD,
+                        help='位移变化阈值（与关键点同单位）')
+    parser.add_argument('--follow', action='store_true', help='在线模式：跟踪捕获文件并逐帧输出变化次数')
+    parser.add_argument('--checkpoint', help='在线模式的检查点文件')
+    parser.add_argument('--smooth', action='store_true', help='在线模式下先对关键点做置信度加权平滑')
+    args = parser.parse_args()
+    thresholds = dict(window=args.window, angle_threshold=args.angle_threshold,
+                      displacement_threshold=args.displacement_threshold)
+
+    if args.follow:
+        last = None
+        try:
+            for t, count in follow_changes(args.input, args.checkpoint, smooth=args.smooth, fps=args.fps,
+                                           timestamp_scale=args.timestamp_scale, **thresholds):
+                if count != last:
+                    sys.stdout.write(json.dumps({'t': t, '变化次数': count}, ensure_ascii=False) + '\n')
+                    sys.stdout.flush()
+                    last = count
+        except KeyboardInterrupt:
+            pass
+        return
+
+    pose = np.load(args.input, mmap_mode='r')
+    if args.timestamps:
+        timestamps = frame_times(np.load(args.timestamps), args.fps, args.timestamp_scale)
+        if len(timestamps) != len(pose):
+            parser.error(f"时间戳数组有 {len(timestamps)} 帧，与姿态数组的 {len(pose)} 帧不一致")
+    else:
+        timestamps = np.arange(len(pose)) / args.fps
+    counts = count_changes(timestamps, *np.asarray(pose, dtype=float).T, **thresholds)
+    np.save(args.output, counts)
+    print(f"共 {len(counts)} 帧，窗口内平均变化次数 {counts.mean():.2f}，结果保存至 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import argparse
+import os
+import socket
+import time
+
+import numpy as np
+
+from 计算绝对开敞度 import find_O_from_F, find_O_from_F_batch
+
+# 默认监听地址（仅本机）
+HOST = '127.0.0.1'
+PORT = 47310
+
+# 单个数据报的最大长度
+BUFFER_SIZE = 65507
+
+# 客户端等待响应的超时（秒）
+TIMEOUT = 0.05
+
+
+def format_solutions(solutions):
+    return ','.join(f"{O:.6f}" for O in solutions if O == O)
+
+
+def handle_request(data):
+    """
+    处理一个请求数据报：UTF-8 文本，含一个或多个以逗号或空白分隔的 F 值，可选以序号 "#<n>" 开头。
+    响应每行对应一个 F，为以逗号分隔的 O 值（升序），无解时为空行；请求无法解析时返回以 ERR 开头的一行。
+    请求带序号时，响应的第一行原样回显 "#<n>"，客户端据此把响应与请求对应起来
+    """
+    try:
+        tokens = data.decode('utf-8').replace(',', ' ').split()
+    except UnicodeDecodeError:
+        return b'ERR invalid request'
+    header = ''
+    if tokens and tokens[0].startswith('#'):
+        header = tokens.pop(0) + '\n'
+    try:
+        F_values = [float(token) for token in tokens]
+    except ValueError:
+        return (header + 'ERR invalid request').encode('utf-8', 'replace')
+    if len(F_values) == 1:
+        return (header + format_solutions(find_O_from_F(F_values[0]))).encode('utf-8', 'replace')
+    lines = [format_solutions(row) for row in find_O_from_F_batch(F_values)]
+    return (header + '\n'.join(lines)).encode('utf-8', 'replace')
+
+
+def open_server_socket(host=HOST, port=PORT, unix_path=None):
+    if unix_path:
+        if os.path.exists(unix_path):
+            os.unlink(unix_path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(unix_path)
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind((host, port))
+    return sock
+
+
+def serve(sock):
+    """
+    单线程数据报循环：模型与反查表只在进程启动时加载一次，每个请求只做一次查表，
+    多个客户端的请求按到达顺序依次应答
+    """
+    while True:
+        data, address = sock.recvfrom(BUFFER_SIZE)
+        if not address:
+            continue
+        try:
+            sock.sendto(handle_request(data), address)
+        except OSError:
+            # 客户端已退出（如 Unix 套接字已删除），不影响其他站点
+            pass
+
+
+class OpennessClient:
+    """
+    MR 站点使用的客户端：复用同一个套接字向本地服务查询 F→O
+    """
+
+    def __init__(self, host=HOST, port=PORT, unix_path=None, timeout=TIMEOUT):
+        if unix_path:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self.sock.bind('')  # Linux 自动绑定抽象地址，用于接收响应
+            self.address = unix_path
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.address = (host, port)
+        self.timeout = timeout
+        self.sequence = 0
+
+    def _receive(self, header):
+        # 丢弃之前超时未读的过期响应，直到收到本次请求序号的响应；总等待时间不超过 timeout
+        deadline = time.monotonic() + self.timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout('timed out')
+            self.sock.settimeout(remaining)
+            reply = self.sock.recv(BUFFER_SIZE).decode('utf-8', 'replace')
+            first, _, body = reply.partition('\n')
+            if first == header:
+                return body
+
+    def query(self, F_value):
+        """
+        返回 F(O) = F_value 在有效范围内的全部 O；超时抛出 socket.timeout
+        """
+        self.sequence += 1
+        header = f"#{self.sequence}"
+        self.sock.sendto(f"{header} {float(F_value)!r}".encode('ascii'), self.address)
+        reply = self._receive(header)
+        if reply.startswith('ERR'):
+            raise ValueError(reply)
+        return np.array([float(O) for O in reply.split(',') if O])
+
+    def close(self):
+        self.sock.close()
+
+
+def benchmark(client, n=10000):
+    """
+    连续发送 n 个随机 F 查询，返回往返延迟的 p50 与 p99（毫秒）
+    """
+    latencies = np.empty(n)
+    for i, F_value in enumerate(np.random.uniform(0, 100, n)):
+        start = time.perf_counter()
+        client.query(F_value)
+        latencies[i] = time.perf_counter() - start
+    return np.percentile(latencies, 50) * 1e3, np.percentile(latencies, 99) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地 F→O 开敞度服务（UDP 或 Unix 数据报套接字）')
+    parser.add_argument('--host', default=HOST, help='UDP 监听地址')
+    parser.add_argument('--port', type=int, default=PORT, help='UDP 端口')
+    parser.add_argument('--unix', metavar='PATH', help='改用 Unix 数据报套接字')
+    parser.add_argument('--query', type=float, metavar='F', help='作为客户端查询一次并退出')
+    parser.add_argument('--bench', type=int, metavar='N', help='作为客户端发送 N 个查询并统计延迟')
+    args = parser.parse_args()
+
+    if args.query is not None or args.bench:
+        client = OpennessClient(args.host, args.port, args.unix)
+        try:
+            if args.query is not None:
+                print(f"当 F = {args.query} 时，可能的O值有：{client.query(args.query)}")
+            if args.bench:
+                p50, p99 = benchmark(client, args.bench)
+                print(f"{args.bench} 次查询：p50 = {p50:.3f} ms，p99 = {p99:.3f} ms")
+        finally:
+            client.close()
+        return
+
+    sock = open_server_socket(args.host, args.port, args.unix)
+    print(f"开敞度服务已启动：{args.unix or f'{args.host}:{args.port}'}")
+    try:
+        serve(sock)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sock.close()
+        if args.unix and os.path.exists(args.unix):
+            os.unlink(args.unix)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,100 +1,52 @@
 import numpy as np
-from scipy.interpolate import CubicSpline
-from sklearn.metrics import r2_score
-import matplotlib.pyplot as plt
 
-# 设置中文显示
-plt.rcParams["font.family"] = ["SimHei", "WenQuanYi Micro Hei", "Heiti TC"]
-plt.rcParams["axes.unicode_minus"] = False  # 解决负号显示问题
+from 拟合模型库 import (draw_comparison, fit_models, import_pyplot, print_polynomial, run_fitting_cli,
+                   spline_inverse)
 
 # 原始数据
 O = np.array([0, 12.5, 25, 37.5, 50, 62.5, 75, 87.5, 100])
 F = np.array([55.55555556, 100, 90.37037037, 26.07407407, 0, 67.72486772, 63.7037037, 83.55555556, 54.81481481])
 
 
-def polynomial_fit(x, y, degree):
+def plot_comparison(O, F, models, figure_path='Focus-Openness_fitting_comparison.png', headless=False):
     """
-    多项式拟合函数，返回拟合系数、R²和RMSE
+    用已拟合的模型绘制开敞度与专注度的对比图（不再为绘图重新拟合）
     """
-    coeffs = np.polyfit(x, y, degree)
-    p = np.poly1d(coeffs)
-    y_pred = p(x)
-    r2 = r2_score(y, y_pred)
-    rmse = np.sqrt(np.mean((y - y_pred) ** 2))
-    return coeffs, r2, rmse, p
+    plt = import_pyplot(headless)
+    fig, ax = plt.subplots(figsize=(12, 8))
+    draw_comparison(ax, O, F, models, '开敞度 O (%)', '专注度 F', '开敞度与专注度的拟合模型对比')
+    fig.savefig(figure_path, dpi=300)
+    if headless:
+        plt.close(fig)
+    else:
+        plt.show()
 
 
-def cubic_spline_fit(x, y):
-    """
-    三次样条插值拟合函数，返回插值对象、R²和RMSE
-    """
-    cs = CubicSpline(x, y)
-    y_pred = cs(x)
-    r2 = r2_score(y, y_pred)
-    rmse = np.sqrt(np.mean((y - y_pred) ** 2))
-    return cs, r2, rmse
-
-
-def print_polynomial(coeffs, degree):
-    """
-    格式化输出多项式表达式
-    """
-    terms = []
-    for i, c in enumerate(coeffs):
-        power = degree - i
-        if power == 0:
-            terms.append(f"{c:.6f}")
-        elif power == 1:
-            terms.append(f"{c:.6f}O")
-        else:
-            terms.append(f"{c:.6f}O^{power}")
-    return " + ".join(terms)
-
+def analyze(O, F, plot=True, figure_path='Focus-Openness_fitting_comparison.png', headless=False):
+    # 全部模型只拟合一次，打印与绘图共用
+    models = fit_models(O, F)
 
-def main():
     # 执行多项式拟合（2-5次）
     print("=" * 50)
     print("多项式拟合结果：")
     print("=" * 50)
 
     for degree in range(2, 6):
-        coeffs, r2, rmse, p = polynomial_fit(O, F, degree)
+        model = models[f'poly{degree}']
         print(f"{degree}次多项式:")
-        print(f"  拟合公式: F(O) = {print_polynomial(coeffs, degree)}")
-        print(f"  R² = {r2:.6f}")
-        print(f"  RMSE = {rmse:.6f}")
+        print(f"  拟合公式: F(O) = {print_polynomial(model.coeffs, degree)}")
+        print(f"  R² = {model.r2:.6f}")
+        print(f"  RMSE = {model.rmse:.6f}")
         print("-" * 50)
 
     # 执行三次样条插值
     print("\n三次样条插值结果:")
-    cs, r2, rmse = cubic_spline_fit(O, F)
-    print(f"  R² = {r2:.6f}")
-    print(f"  RMSE = {rmse:.6f}")
-
-    # 绘制拟合结果对比图
-    plt.figure(figsize=(12, 8))
-    plt.scatter(O, F, color='red', label='原始数据')
-
-    # 绘制各多项式拟合曲线
-    O_fine = np.linspace(0, 100, 500)
-    colors = ['blue', 'green', 'purple', 'orange']
-
-    for i, degree in enumerate(range(2, 6)):
-        _, _, _, p = polynomial_fit(O, F, degree)
-        plt.plot(O_fine, p(O_fine), color=colors[i],
-                 label=f'{degree}次多项式 (R²={r2_score(F, p(O)):.4f})')
-
-    # 绘制三次样条曲线
-    plt.plot(O_fine, cs(O_fine), color='black', linestyle='--',
-             label=f'三次样条 (R²={r2_score(F, cs(O)):.4f})')
-
-    plt.xlabel('开敞度 O (%)')
-    plt.ylabel('专注度 F')
-    plt.title('开敞度与专注度的拟合模型对比')
-    plt.legend()
-    plt.grid(True)
-    plt.savefig('fitting_comparison.png', dpi=300)
-    plt.show()
+    cs = models['spline']
+    print(f"  R² = {cs.r2:.6f}")
+    print(f"  RMSE = {cs.rmse:.6f}")
+
+    if plot:
+        plot_comparison(O, F, list(models.values()), figure_path, headless)
 
     # 输出专注度计算公式
     print("\n专注度计算公式:")
@@ -107,33 +59,23 @@ def main():
         f = cs(o)
         print(f"O={o}%, F={f:.4f}")
 
-    # 解方程 F(O) = target_F 求 O
-    def solve_O(target_F, cs, initial_guess=50):
-        """使用牛顿法解方程 F(O) = target_F"""
-        from scipy.optimize import newton
-
-        def equation(O):
-            return cs(O) - target_F
-
-        try:
-            result = newton(equation, initial_guess, fprime=cs.derivative())
-            if 0 <= result <= 100:
-                return result
-            else:
-                return None
-        except:
-            return None
-
-    # 计算给定F对应的O值
+    # 计算给定F对应的O值：在每段样条上解析求解三次方程，列出 [0, 100] 内的全部解
     print("\n给定专注度F计算对应的开敞度O:")
     target_F_values = [0, 25, 50, 75, 100]
-    for target_F in target_F_values:
-        O_solution = solve_O(target_F, cs)
-        if O_solution is not None:
-            print(f"当F={target_F}时，O≈{O_solution:.2f}%")
+    solutions = spline_inverse(cs, target_F_values, 0, 100)
+    for target_F, row in zip(target_F_values, solutions):
+        row = row[~np.isnan(row)]
+        if len(row):
+            print(f"当F={target_F}时，O≈{'、'.join(f'{o:.2f}%' for o in row)}")
         else:
             print(f"无法找到F={target_F}对应的O值（超出范围或无解）")
 
 
+def main():
+    run_fitting_cli('开敞度与专注度的拟合模型对比',
+                    '两列 CSV 数据集（O, F）或包含这些 CSV 的目录；不指定时使用脚本内的原始数据',
+                    analyze, O, F, 'Focus-Openness_fitting_comparison.png', '_fitting_comparison')
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,113 +1,71 @@
 import numpy as np
-from scipy.interpolate import CubicSpline
-from sklearn.metrics import r2_score
-import matplotlib.pyplot as plt
 
-# 设置中文显示
-plt.rcParams["font.family"] = ["SimHei", "WenQuanYi Micro Hei", "Heiti TC"]
-plt.rcParams["axes.unicode_minus"] = False  # 解决负号显示问题
+from 拟合模型库 import (SCORE_CENTER, SCORE_SCALE, draw_comparison, fit_models, import_pyplot, print_polynomial,
+                   run_fitting_cli, score_to_focus)
 
 # 原始数据
 O = np.array([0, 12.5, 25, 37.5, 50, 62.5, 75, 87.5, 100])
 S = np.array([55.55556, 100, 90.37037, 26.074074, 0, 67.7249, 63.7037, 83.55556, 54.81481])
 
 
-def polynomial_fit(x, y, degree):
+def plot_comparison(O, S, models, figure_path='score-openness_fitting_comparison.png', headless=False):
     """
-    多项式拟合函数，返回拟合系数、R²和RMSE
+    用已拟合的模型绘制开敞度与平均得分的对比图
     """
-    coeffs = np.polyfit(x, y, degree)
-    p = np.poly1d(coeffs)
-    y_pred = p(x)
-    r2 = r2_score(y, y_pred)
-    rmse = np.sqrt(np.mean((y - y_pred) ** 2))
-    return coeffs, r2, rmse, p
+    plt = import_pyplot(headless)
+    fig, ax = plt.subplots(figsize=(12, 8))
+    draw_comparison(ax, O, S, models, '开敞度 (%)', '平均得分', '开敞度与平均得分的拟合模型对比')
+    fig.savefig(figure_path, dpi=300)
+    if headless:
+        plt.close(fig)
+    else:
+        plt.show()
 
 
-def cubic_spline_fit(x, y):
-    """
-    三次样条插值拟合函数，返回插值对象、R²和RMSE
-    """
-    cs = CubicSpline(x, y)
-    y_pred = cs(x)
-    r2 = r2_score(y, y_pred)
-    rmse = np.sqrt(np.mean((y - y_pred) ** 2))
-    return cs, r2, rmse
-
-
-def print_polynomial(coeffs, degree):
-    """
-    格式化输出多项式表达式
-    """
-    terms = []
-    for i, c in enumerate(coeffs):
-        power = degree - i
-        if power == 0:
-            terms.append(f"{c:.6f}")
-        elif power == 1:
-            terms.append(f"{c:.6f}O")
-        else:
-            terms.append(f"{c:.6f}O^{power}")
-    return " + ".join(terms)
+def analyze(O, S, plot=True, figure_path='score-openness_fitting_comparison.png', headless=False):
+    # 全部模型只拟合一次，打印与绘图共用
+    models = fit_models(O, S)
 
-
-def main():
     # 执行多项式拟合（2-5次）
     print("=" * 50)
     print("多项式拟合结果：")
     print("=" * 50)
 
     for degree in range(2, 6):
-        coeffs, r2, rmse, p = polynomial_fit(O, S, degree)
+        model = models[f'poly{degree}']
         print(f"{degree}次多项式:")
-        print(f"  拟合公式: S(O) = {print_polynomial(coeffs, degree)}")
-        print(f"  R² = {r2:.6f}")
-        print(f"  RMSE = {rmse:.6f}")
+        print(f"  拟合公式: S(O) = {print_polynomial(model.coeffs, degree)}")
+        print(f"  R² = {model.r2:.6f}")
+        print(f"  RMSE = {model.rmse:.6f}")
         print("-" * 50)
 
     # 执行三次样条插值
     print("\n三次样条插值结果:")
-    cs, r2, rmse = cubic_spline_fit(O, S)
-    print(f"  R² = {r2:.6f}")
-    print(f"  RMSE = {rmse:.6f}")
-
-    # 绘制拟合结果对比图
-    plt.figure(figsize=(12, 8))
-    plt.scatter(O, S, color='red', label='原始数据')
-
-    # 绘制各多项式拟合曲线
-    O_fine = np.linspace(0, 100, 500)
-    colors = ['blue', 'green', 'purple', 'orange']
-
-    for i, degree in enumerate(range(2, 6)):
-        _, _, _, p = polynomial_fit(O, S, degree)
-        plt.plot(O_fine, p(O_fine), color=colors[i],
-                 label=f'{degree}次多项式 (R²={r2_score(S, p(O)):.4f})')
-
-    # 绘制三次样条曲线
-    plt.plot(O_fine, cs(O_fine), color='black', linestyle='--',
-             label=f'三次样条 (R²={r2_score(S, cs(O)):.4f})')
-
-    plt.xlabel('开敞度 (%)')
-    plt.ylabel('平均得分')
-    plt.title('开敞度与平均得分的拟合模型对比')
-    plt.legend()
-    plt.grid(True)
-    plt.savefig('fitting_comparison.png', dpi=300)
-    plt.show()
+    cs = models['spline']
+    print(f"  R² = {cs.r2:.6f}")
+    print(f"  RMSE = {cs.rmse:.6f}")
+
+    if plot:
+        plot_comparison(O, S, list(models.values()), figure_path, headless)
 
     # 输出专注度计算公式
     print("\n专注度计算公式:")
-    print("F(O) = ((S(O) - 79) / 33.75)³")
+    print(f"F(O) = ((S(O) - {SCORE_CENTER}) / {SCORE_SCALE})³")
 
     # 计算关键点的专注度
     print("\n关键点的专注度计算:")
     key_points = [12.5, 25, 50, 87.5]
     for o in key_points:
         s = cs(o)
-        f = ((s - 79) / 33.75) ** 3
+        f = score_to_focus(s)
         print(f"O={o}%, S={s:.4f}, F={f:.4f}")
 
 
+def main():
+    run_fitting_cli('开敞度与平均得分的拟合模型对比',
+                    '两列 CSV 数据集（O, S）或包含这些 CSV 的目录；不指定时使用脚本内的原始数据',
+                    analyze, O, S, 'score-openness_fitting_comparison.png', '_fitting_comparison')
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
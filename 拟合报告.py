@@ -0,0 +1,92 @@
+import argparse
+import html
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from 拟合模型库 import (DEFAULT_MODELS, draw_comparison, expand_datasets, fit_models, import_pyplot, load_dataset,
+                   unique_stems)
+
+# 报告图像的分辨率（单张图写入报告，无需 300 dpi）
+REPORT_DPI = 100
+
+# 报告图像尺寸（英寸）
+FIGSIZE = (8, 5)
+
+
+def _init_worker():
+    # 每个工作进程只导入一次 matplotlib，并固定使用非交互式 Agg 后端
+    import_pyplot(headless=True)
+
+
+def render_dataset(job):
+    """
+    拟合一个数据集的全部模型（每个模型只拟合一次），用已拟合的模型绘制对比图并写入 figure_path；
+    返回 (stem, figure_path, [(模型名, R², RMSE), ...])
+    """
+    path, stem, figure_path, names, ylabel, dpi = job
+    from matplotlib.figure import Figure
+
+    x, y = load_dataset(path)
+    models = fit_models(x, y, names)
+    # 不经过 pyplot 的全局状态，图像用完即释放；固定边距代替 tight_layout，省去一次额外的完整绘制
+    fig = Figure(figsize=FIGSIZE)
+    fig.subplots_adjust(left=0.09, right=0.97, bottom=0.1, top=0.93)
+    ax = fig.add_subplot()
+    draw_comparison(ax, x, y, list(models.values()), ylabel=ylabel, title=f'{stem}：开敞度与{ylabel}的拟合模型对比')
+    fig.savefig(figure_path, dpi=dpi)
+    return stem, figure_path, [(name, model.r2, model.rmse) for name, model in models.items()]
+
+
+def write_index(results, out_dir, names):
+    """
+    生成汇总页 index.html：每个数据集一行，列出各模型的 R² 与对比图
+    """
+    rows = []
+    for stem, figure_path, scores in results:
+        cells = ''.join(f'<td>{r2:.4f}</td>' for _, r2, _ in scores)
+        image = html.escape(os.path.basename(figure_path))
+        rows.append(f'<tr><td>{html.escape(stem)}</td>{cells}'
+                    f'<td><a href="{image}"><img src="{image}" width="320"></a></td></tr>')
+    header = ''.join(f'<th>{html.escape(name)} R²</th>' for name in names)
+    index_path = os.path.join(out_dir, 'index.html')
+    with open(index_path, 'w', encoding='utf-8') as f:
+        f.write('<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>拟合报告</title></head><body>\n')
+        f.write(f'<table border="1"><tr><th>数据集</th>{header}<th>对比图</th></tr>\n')
+        f.write('\n'.join(rows))
+        f.write('\n</table></body></html>\n')
+    return index_path
+
+
+def build_report(paths, out_dir, names=DEFAULT_MODELS, ylabel='专注度 F', dpi=REPORT_DPI, workers=None):
+    """
+    在非交互式工作进程池中并行渲染每个数据集的对比图（<数据集名>_fitting_comparison.png，名称互不重复），
+    返回按输入顺序排列的渲染结果与汇总页路径
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(path, stem, os.path.join(out_dir, f"{stem}_fitting_comparison.png"), tuple(names), ylabel, dpi)
+            for path, stem in zip(paths, unique_stems(paths))]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        results = list(pool.map(render_dataset, jobs, chunksize=4))
+    return results, write_index(results, out_dir, names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='并行生成多参与者/多数据集的拟合对比图报告')
+    parser.add_argument('datasets', nargs='+', help='两列 CSV 数据集（O, F/S），或包含这些 CSV 的目录')
+    parser.add_argument('-o', '--out-dir', default='fitting_report', help='报告输出目录')
+    parser.add_argument('--models', nargs='+', default=list(DEFAULT_MODELS), help='要拟合并绘制的模型名称')
+    parser.add_argument('--ylabel', default='专注度 F', help='纵轴名称（如 平均得分）')
+    parser.add_argument('--dpi', type=int, default=REPORT_DPI, help='图像分辨率')
+    parser.add_argument('--workers', type=int, default=None, help='并行进程数')
+    args = parser.parse_args()
+
+    paths = expand_datasets(args.datasets)
+
+    start = time.perf_counter()
+    results, index_path = build_report(paths, args.out_dir, args.models, args.ylabel, args.dpi, args.workers)
+    print(f"已渲染 {len(results)} 张对比图，用时 {time.perf_counter() - start:.1f} 秒 → {index_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,609 @@
+import argparse
+import glob
+import os
+
+import numpy as np
+
+# 已注册的模型：名称 → 拟合函数 fitter(x, y)，返回 FittedModel
+MODEL_REGISTRY = {}
+
+# 默认参与比较的模型
+DEFAULT_MODELS = ('poly2', 'poly3', 'poly4', 'poly5', 'spline')
+
+# 平均得分换算为专注度：F = ((S - SCORE_CENTER) / SCORE_SCALE)³
+SCORE_CENTER = 79
+SCORE_SCALE = 33.75
+
+
+def r2_score(y, y_pred):
+    """
+    决定系数 R²（与 sklearn.metrics.r2_score 对一维数据的结果相同）
+    """
+    y = np.asarray(y, dtype=float)
+    ss_res = np.sum((y - y_pred) ** 2)
+    ss_tot = np.sum((y - np.mean(y)) ** 2)
+    return 1 - ss_res / ss_tot if ss_tot > 0 else (1.0 if ss_res == 0 else 0.0)
+
+
+def rmse_score(y, y_pred):
+    return np.sqrt(np.mean((np.asarray(y, dtype=float) - y_pred) ** 2))
+
+
+class FittedModel:
+    """
+    拟合结果，只依赖 numpy 即可求值：
+    kind 为 'poly' 时 coeffs 为从高次到低次的多项式系数；
+    kind 为 'spline' 时为分段多项式，breaks 为节点，coeffs[:, i] 为第 i 段关于 (x - breaks[i]) 的系数（从高次到低次）
+    """
+
+    def __init__(self, name, kind, coeffs, breaks=None, r2=np.nan, rmse=np.nan):
+        self.name = name
+        self.kind = kind
+        self.coeffs = np.asarray(coeffs, dtype=float)
+        self.breaks = None if breaks is None else np.asarray(breaks, dtype=float)
+        self.r2 = r2
+        self.rmse = rmse
+
+    def __call__(self, x):
+        x = np.asarray(x, dtype=float)
+        if self.kind == 'poly':
+            return np.polyval(self.coeffs, x)
+        # 与 scipy 的 CubicSpline 一致：区间外用首末两段外推
+        i = np.clip(np.searchsorted(self.breaks, x, side='right') - 1, 0, len(self.breaks) - 2)
+        t = x - self.breaks[i]
+        y = np.zeros_like(t)
+        for c in self.coeffs:
+            y = y * t + c[i]
+        return y
+
+    def __repr__(self):
+        return f"FittedModel({self.name!r}, R²={self.r2:.6f}, RMSE={self.rmse:.6f})"
+
+
+def register_model(name):
+    """
+    注册模型的装饰器：被装饰的函数接收 (x, y)，返回 FittedModel
+    """
+    def decorator(fitter):
+        MODEL_REGISTRY[name] = fitter
+        return fitter
+    return decorator
+
+
+def _register_polynomial(degree):
+    @register_model(f'poly{degree}')
+    def fit_polynomial(x, y):
+        return FittedModel(f'poly{degree}', 'poly', np.polyfit(x, y, degree))
+
+
+for _degree in range(2, 6):
+    _register_polynomial(_degree)
+
+
+def average_duplicates(x, y):
+    """
+    按 x 升序排列，同一 x 的多个观测取均值；返回 (unique_x, mean_y)。
+    样条要求节点严格递增，而参与者数据常在同一开敞度水平上有多次测量
+    """
+    unique_x, inverse = np.unique(np.asarray(x, dtype=float), return_inverse=True)
+    mean_y = np.bincount(inverse, weights=np.asarray(y, dtype=float)) / np.bincount(inverse)
+    return unique_x, mean_y
+
+
+@register_model('spline')
+def fit_spline(x, y):
+    # scipy 只在拟合样条时才导入，加载已保存的模型不需要 scipy
+    from scipy.interpolate import CubicSpline
+    cs = CubicSpline(*average_duplicates(x, y))
+    return FittedModel('spline', 'spline', cs.c, cs.x)
+
+
+def fit_model(name, x, y):
+    """
+    按名称拟合已注册的模型，并计算样本内 R² 与 RMSE
+    """
+    if name not in MODEL_REGISTRY:
+        raise KeyError(f"未注册的模型：{name}（可用：{', '.join(MODEL_REGISTRY)}）")
+    model = MODEL_REGISTRY[name](x, y)
+    y_pred = model(x)
+    model.r2 = r2_score(y, y_pred)
+    model.rmse = rmse_score(y, y_pred)
+    return model
+
+
+def fit_models(x, y, names=DEFAULT_MODELS):
+    return {name: fit_model(name, x, y) for name in names}
+
+
+def _compose_linear(coeffs, offset, slope):
+    # 多项式（从低次到高次）代入 offset + slope·z，返回关于 z 的系数（从低次到高次，长度不变）
+    result = np.zeros(len(coeffs))
+    for c in coeffs[::-1]:
+        result = np.convolve(result, [offset, slope])[:len(coeffs)]
+        result[0] += c
+    return result
+
+
+class RecursiveLeastSquares:
+    """
+    多项式模型的递推最小二乘（RLS）在线拟合：每个新观测以 O(d²) 更新系数，无需批量重新拟合。
+    forgetting < 1 时按指数遗忘旧观测，使模型随会话逐渐适应当前用户；
+    自变量先映射到 [-1, 1]（(x - center) / scale，开敞度默认为 (O - 50) / 50）以改善高次项的条件数。
+    可用 coeffs（原始尺度、从高次到低次，如群体模型的系数）作为先验起点，delta 为先验协方差的尺度，越大先验越弱
+    """
+
+    def __init__(self, degree, forgetting=1.0, center=50.0, scale=50.0, delta=1e8, coeffs=None):
+        if not 0 < forgetting <= 1:
+            raise ValueError("遗忘因子必须在 (0, 1] 内")
+        self.degree = degree
+        self.forgetting = forgetting
+        self.center = center
+        self.scale = scale
+        self.powers = np.arange(degree + 1)
+        # theta 为映射后自变量的系数（从低次到高次）
+        self.theta = np.zeros(degree + 1)
+        if coeffs is not None:
+            self.theta = _compose_linear(np.asarray(coeffs, dtype=float)[::-1], center, scale)
+        self.P = delta * np.eye(degree + 1)
+        self.n_updates = 0
+
+    @classmethod
+    def from_model(cls, model, forgetting=1.0, center=50.0, scale=50.0, delta=1.0):
+        """
+        以已拟合的多项式模型为先验起点，在会话中继续在线更新
+        """
+        if model.kind != 'poly':
+            raise ValueError("只支持多项式模型")
+        return cls(len(model.coeffs) - 1, forgetting, center, scale, delta, model.coeffs)
+
+    def update(self, x, y):
+        """
+        加入一个观测 (x, y)，返回更新前的预测误差
+        """
+        phi = ((x - self.center) / self.scale) ** self.powers
+        P_phi = self.P @ phi
+        gain = P_phi / (self.forgetting + phi @ P_phi)
+        error = y - phi @ self.theta
+        self.theta = self.theta + gain * error
+        self.P = (self.P - np.outer(gain, P_phi)) / self.forgetting
+        self.n_updates += 1
+        return error
+
+    def update_many(self, x, y):
+        """
+        按顺序加入一批观测，返回各自的预测误差
+        """
+        return np.array([self.update(xi, yi) for xi, yi in zip(np.ravel(x), np.ravel(y))])
+
+    def coefficients(self):
+        """
+        原始尺度下从高次到低次的多项式系数（与 np.polyfit 相同的约定）
+        """
+        return _compose_linear(self.theta, -self.center / self.scale, 1 / self.scale)[::-1]
+
+    def __call__(self, x):
+        x = np.asarray(x, dtype=float)
+        return (((x - self.center) / self.scale)[..., None] ** self.powers) @ self.theta
+
+    def to_model(self):
+        return FittedModel(f'poly{self.degree}', 'poly', self.coefficients())
+
+
+def _masked_moments(x, y):
+    # 批量数据中 NaN 视为缺失，返回有效点数、均值及中心化后的 x、y（缺失处为 0）
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    mask = ~(np.isnan(x) | np.isnan(y))
+    n = mask.sum(axis=-1)
+    x_mean = np.divide(np.where(mask, x, 0).sum(axis=-1), n, out=np.full(n.shape, np.nan), where=n > 0)
+    y_mean = np.divide(np.where(mask, y, 0).sum(axis=-1), n, out=np.full(n.shape, np.nan), where=n > 0)
+    dx = np.where(mask, x - x_mean[..., None], 0.0)
+    dy = np.where(mask, y - y_mean[..., None], 0.0)
+    return n, x_mean, y_mean, dx, dy, mask
+
+
+def negative_slope_line_fit(x, y):
+    """
+    斜率约束为非正的最小二乘直线拟合 y = a·x + b（闭式解），可一次求解一批互相独立的拟合：
+    x、y 形状为 (..., n)，NaN 视为缺失。无约束解的斜率为负时即为最优解；
+    否则约束起作用，最优斜率为 0、截距为 y 的均值。返回 (a, b, r2)，形状均为 (...)
+    """
+    n, x_mean, y_mean, dx, dy, _ = _masked_moments(x, y)
+    sxx = np.sum(dx ** 2, axis=-1)
+    sxy = np.sum(dx * dy, axis=-1)
+    syy = np.sum(dy ** 2, axis=-1)
+    a = np.minimum(np.divide(sxy, sxx, out=np.zeros(sxx.shape), where=sxx > 0), 0.0)
+    b = y_mean - a * x_mean
+    # 残差平方和 = Syy - 2a·Sxy + a²·Sxx
+    ss_res = syy - 2 * a * sxy + a ** 2 * sxx
+    r2 = np.divide(syy - ss_res, syy, out=np.full(syy.shape, np.nan), where=syy > 0)
+    return a, b, r2
+
+
+def quadratic_fit_batch(x, y):
+    """
+    二次函数 y = a·x² + b·x + c 的精确最小二乘拟合，可一次求解一批互相独立的拟合：
+    x、y 形状为 (..., n)，NaN 视为缺失；在中心化的 x 上解 3×3 正规方程以保证数值稳定。
+    返回 (a, b, c, vertex_x, vertex_y, r2, curvature)，curvature 为 a 的符号（-1 即倒 U 型）；
+    有效点中不同 x 少于 3 个的拟合结果为 NaN
+    """
+    n, x_mean, y_mean, u, dy, mask = _masked_moments(x, y)
+    y = np.where(mask, np.broadcast_to(np.asarray(y, dtype=float), mask.shape), 0.0)
+    u2 = u ** 2
+    s2, s3, s4 = u2.sum(axis=-1), (u2 * u).sum(axis=-1), (u2 * u2).sum(axis=-1)
+    normal = np.stack([np.stack([s4, s3, s2], axis=-1),
+                       np.stack([s3, s2, np.zeros_like(s2)], axis=-1),
+                       np.stack([s2, np.zeros_like(s2), n.astype(float)], axis=-1)], axis=-2)
+    rhs = np.stack([(u2 * y).sum(axis=-1), (u * y).sum(axis=-1), y.sum(axis=-1)], axis=-1)
+
+    # 退化的拟合（不同 x 少于 3 个）先用单位阵占位，结果再置为 NaN
+    sorted_x = np.sort(np.where(mask, u, np.nan), axis=-1)
+    singular = np.sum(np.diff(sorted_x, axis=-1) > 0, axis=-1) + (n > 0) < 3
+    normal[singular] = np.eye(3)
+    a, b_u, c_u = np.moveaxis(np.linalg.solve(normal, rhs[..., None])[..., 0], -1, 0)
+
+    # 由中心化坐标换回原坐标：y = a(x - m)² + b_u(x - m) + c_u
+    b = b_u - 2 * a * x_mean
+    c = a * x_mean ** 2 - b_u * x_mean + c_u
+    vertex_x = x_mean + np.divide(-b_u, 2 * a, out=np.full(a.shape, np.nan), where=a != 0)
+    vertex_y = c_u - np.divide(b_u ** 2, 4 * a, out=np.full(a.shape, np.nan), where=a != 0)
+
+    residual = np.where(mask, y - (a[..., None] * u2 + b_u[..., None] * u + c_u[..., None]), 0.0)
+    ss_tot = np.sum(dy ** 2, axis=-1)
+    r2 = np.divide(ss_tot - np.sum(residual ** 2, axis=-1), ss_tot, out=np.full(a.shape, np.nan),
+                   where=ss_tot > 0)
+    return tuple(np.where(singular, np.nan, result) for result in (a, b, c, vertex_x, vertex_y, r2, np.sign(a)))
+
+
+def quadratic_roots(a, b, c):
+    """
+    向量化求解 a·t² + b·t + c = 0 的实根，返回 (..., 2)，无实根处为 NaN；a 为 0 时退化为一次方程
+    """
+    a, b, c = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, b, c)))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        disc = b ** 2 - 4 * a * c
+        # 数值稳定的求根公式，避免 b 与 sqrt(disc) 相减造成的抵消
+        q = -(b + np.copysign(np.sqrt(np.maximum(disc, 0.0)), b)) / 2
+        root1 = np.where(a != 0, q / a, np.where(b != 0, -c / b, np.nan))
+        root2 = np.where(a != 0, np.where(q != 0, c / q, q / a), np.nan)
+        real = (a == 0) | (disc >= 0)
+    return np.stack([np.where(real, root1, np.nan), np.where(real, root2, np.nan)], axis=-1)
+
+
+def cubic_roots(a, b, c, d):
+    """
+    向量化解析求解 a·t³ + b·t² + c·t + d = 0 的全部实根，返回 (..., 3)，非实根处为 NaN。
+    先用三角公式（三实根）或卡尔达诺公式（单实根）求出模最大的实根 r，再除以 (t - r) 降为二次方程求其余两根：
+    a 相对 b 很小（接近二次）时公式对小根会丢失精度，而模最大的根与降阶后的二次方程仍是准确的。
+    每个根做牛顿修正并剔除残差过大的值；a 为 0 时退化为二次方程
+    """
+    a, b, c, d = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, b, c, d)))
+    A, Bc, Cc, Dc = (v[..., None] for v in (a, b, c, d))
+
+    def polish(t):
+        # 一次牛顿修正，消除公式中的舍入误差
+        value = ((A * t + Bc) * t + Cc) * t + Dc
+        slope = (3 * A * t + 2 * Bc) * t + Cc
+        return t - np.divide(value, slope, out=np.zeros_like(t), where=np.isfinite(t) & (slope != 0))
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        B, C, D = b / a, c / a, d / a
+        # 化为缺项三次方程 s³ + p·s + q = 0，t = s - B/3
+        p = C - B ** 2 / 3
+        q = 2 * B ** 3 / 27 - B * C / 3 + D
+        delta = (q / 2) ** 2 + (p / 3) ** 3
+
+        # 单实根：u = ∛(-q/2 - sign(q)·√Δ)，s = u - p/(3u)
+        u = np.cbrt(-q / 2 - np.copysign(np.sqrt(np.maximum(delta, 0.0)), q))
+        single = np.where(u != 0, u - p / (3 * u), 0.0) - B / 3
+
+        # 三实根：s_k = 2√(-p/3)·cos(θ/3 - 2πk/3)，取其中模最大的一个
+        m = 2 * np.sqrt(np.maximum(-p / 3, 0.0))
+        cos_theta = np.clip(np.divide(3 * q, p * m, out=np.zeros_like(p), where=p * m != 0), -1.0, 1.0)
+        theta = np.arccos(cos_theta)[..., None]
+        triple = m[..., None] * np.cos(theta / 3 - 2 * np.pi * np.arange(3) / 3) - (B / 3)[..., None]
+        largest = np.take_along_axis(triple, np.argmax(np.abs(np.nan_to_num(triple)), axis=-1)[..., None], axis=-1)
+
+        r = polish(polish(np.where((delta <= 0)[..., None], largest, single[..., None])))
+
+        # 除以 (t - r) 得 a·t² + e1·t + e0：从常数项算起的后向降阶对模最大的根数值稳定；r 为 0 时即去掉常数项
+        nonzero = r != 0
+        safe_r = np.where(nonzero, r, 1.0)
+        e0 = np.where(nonzero, -Dc / safe_r, Cc)
+        e1 = np.where(nonzero, (e0 - Cc) / safe_r, Bc)
+        rest = quadratic_roots(a, e1[..., 0], e0[..., 0])
+        # 近重根时判别式的舍入误差可能使其略小于 0，此时取顶点作为候选，是否为根由下面的残差检验决定
+        rest = np.where(np.isnan(rest), -e1 / (2 * A), rest)
+        t = polish(np.concatenate([r, rest], axis=-1))
+
+        # 按相对残差剔除并非根的值（复根对应的顶点、近重根时公式给出的偏差值）
+        value = ((A * t + Bc) * t + Cc) * t + Dc
+        scale = np.abs(A * t ** 3) + np.abs(Bc * t ** 2) + np.abs(Cc * t) + np.abs(Dc)
+        t = np.where(np.abs(value) <= 1e-9 * scale, t, np.nan)
+
+    quadratic = np.concatenate([quadratic_roots(b, c, d), np.full(a.shape + (1,), np.nan)], axis=-1)
+    return np.where((a == 0)[..., None], quadratic, t)
+
+
+def _pack_roots(roots, tol):
+    # 每行升序排列，相邻重复的根（如落在两段相接的节点上）只保留一个，并去掉全为 NaN 的列
+    roots = np.sort(roots, axis=1)
+    duplicate = np.zeros(roots.shape, dtype=bool)
+    duplicate[:, 1:] = np.diff(roots, axis=1) <= tol
+    roots = np.sort(np.where(duplicate, np.nan, roots), axis=1)
+    width = int(np.max(np.sum(~np.isnan(roots), axis=1), initial=0))
+    return roots[:, :width]
+
+
+def _spline_pieces(model, lo, hi):
+    # 样条在 [lo, hi] 内的各段：(段号, 段内局部坐标的起止 t0、t1)
+    if model.kind != 'spline':
+        raise ValueError("只支持分段三次样条模型")
+    lo = model.breaks[0] if lo is None else lo
+    hi = model.breaks[-1] if hi is None else hi
+    pieces = []
+    for i in range(len(model.breaks) - 1):
+        start, stop = max(lo, model.breaks[i]), min(hi, model.breaks[i + 1])
+        if start <= stop:
+            pieces.append((i, start - model.breaks[i], stop - model.breaks[i]))
+    return pieces, lo, hi
+
+
+def _cubic_coeffs(model):
+    # 补齐为三次（从高次到低次）的每段系数，形状 (4, 段数)
+    return np.vstack([np.zeros((4 - len(model.coeffs), model.coeffs.shape[1])), model.coeffs])
+
+
+def spline_inverse(model, targets, lo=None, hi=None, chunk=4096):
+    """
+    求 [lo, hi]（默认为样条节点范围）内满足 model(O) = target 的全部 O：
+    在每一段上解析求解三次方程，对大批量 targets 分块向量化计算。
+    返回 (len(targets), k) 数组，每行为升序排列的全部解，不足处为 NaN
+    """
+    targets = np.asarray(targets, dtype=float).ravel()
+    pieces, lo, hi = _spline_pieces(model, lo, hi)
+    index = np.array([i for i, _, _ in pieces])
+    t0 = np.array([start for _, start, _ in pieces])
+    t1 = np.array([stop for _, _, stop in pieces])
+    a, b, c, d = _cubic_coeffs(model)[:, index]
+    tol = 1e-9 * (hi - lo)
+
+    results = []
+    for begin in range(0, len(targets), chunk):
+        target = targets[begin:begin + chunk, None]
+        t = cubic_roots(a, b, c, d - target)
+        inside = (t >= t0[:, None] - tol) & (t <= t1[:, None] + tol)
+        O = np.clip(model.breaks[index][:, None] + t, lo, hi)
+        results.append(np.where(inside, O, np.nan).reshape(len(target), -1))
+    if not results:
+        return np.empty((0, 0))
+    packed = [_pack_roots(r, tol) for r in results]
+    width = max(r.shape[1] for r in packed)
+    return np.vstack([np.pad(r, ((0, 0), (0, width - r.shape[1])), constant_values=np.nan) for r in packed])
+
+
+class SplineInverter:
+    """
+    预编译的样条反查网格：把每段按导数零点再分成单调子段，并按全部子段端点的函数值把值域切成若干格，
+    预先记下每一格可能含解的子段。查询时二分定位所在格，只对这些候选子段解析求解三次方程，
+    每个查询的计算量固定（与段数无关），结果与 spline_inverse 相同
+    """
+
+    def __init__(self, model, lo=None, hi=None):
+        pieces, self.lo, self.hi = _spline_pieces(model, lo, hi)
+        self.tol = 1e-9 * (self.hi - self.lo)
+        coeffs = _cubic_coeffs(model)
+        segments = []  # (段号, t 起, t 止, 值下限, 值上限)
+        for i, start, stop in pieces:
+            a, b, c, d = coeffs[:, i]
+            turning = quadratic_roots(3 * a, 2 * b, c)
+            turning = np.sort(turning[(turning > start) & (turning < stop)])
+            bounds = [start, *turning, stop]
+            for t_start, t_stop in zip(bounds[:-1], bounds[1:]):
+                values = np.polyval(coeffs[:, i], [t_start, t_stop])
+                segments.append((i, t_start, t_stop, values.min(), values.max()))
+        segments = np.array(segments)
+        self.piece = segments[:, 0].astype(int)
+        self.t_start, self.t_stop = segments[:, 1], segments[:, 2]
+        self.coeffs = coeffs[:, self.piece]
+        self.origin = model.breaks[self.piece]
+
+        # 值域网格：每一格 [levels[k], levels[k+1]] 的候选子段
+        self.levels = np.unique(segments[:, 3:])
+        # 端点函数值由 polyval 算出，与节点处的真实值可能相差几个 ulp，值域比较时放宽 value_tol
+        self.value_tol = 1e-9 * max(self.levels[-1] - self.levels[0], np.abs(self.levels).max(), 1.0)
+        upper = np.append(self.levels[1:], self.levels[-1])
+        candidates = [np.flatnonzero((segments[:, 3] <= high + self.value_tol)
+                                     & (segments[:, 4] >= low - self.value_tol))
+                      for low, high in zip(self.levels, upper)]
+        width = max(len(c) for c in candidates)
+        self.candidates = np.full((len(candidates), width), -1)
+        for k, c in enumerate(candidates):
+            self.candidates[k, :len(c)] = c
+
+    def query(self, targets):
+        """
+        返回 (len(targets), k) 数组，每行为升序排列的全部解，不足处为 NaN
+        """
+        targets = np.asarray(targets, dtype=float).ravel()
+        cell = np.searchsorted(self.levels, targets, side='right') - 1
+        in_range = ((targets >= self.levels[0] - self.value_tol)
+                    & (targets <= self.levels[-1] + self.value_tol))
+        segment = np.where(in_range[:, None], self.candidates[np.clip(cell, 0, len(self.levels) - 1)], -1)
+        valid = segment >= 0
+        segment = np.where(valid, segment, 0)
+
+        a, b, c, d = self.coeffs[:, segment]
+        t = cubic_roots(a, b, c, d - targets[:, None])
+        inside = (valid[..., None] & (t >= self.t_start[segment][..., None] - self.tol)
+                  & (t <= self.t_stop[segment][..., None] + self.tol))
+        O = np.clip(self.origin[segment][..., None] + t, self.lo, self.hi)
+        return _pack_roots(np.where(inside, O, np.nan).reshape(len(targets), -1), self.tol)
+
+
+def score_to_focus(S):
+    return ((np.asarray(S, dtype=float) - SCORE_CENTER) / SCORE_SCALE) ** 3
+
+
+def print_polynomial(coeffs, degree, variable='O'):
+    """
+    格式化输出多项式表达式
+    """
+    terms = []
+    for i, c in enumerate(coeffs):
+        power = degree - i
+        if power == 0:
+            terms.append(f"{c:.6f}")
+        elif power == 1:
+            terms.append(f"{c:.6f}{variable}")
+        else:
+            terms.append(f"{c:.6f}{variable}^{power}")
+    return " + ".join(terms)
+
+
+def import_pyplot(headless=False):
+    """
+    按需导入 matplotlib 并设置中文字体；headless 时使用非交互式 Agg 后端，绘图只写文件、不会阻塞
+    """
+    import matplotlib
+    if headless:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    # 设置中文显示
+    plt.rcParams["font.family"] = ["SimHei", "WenQuanYi Micro Hei", "Heiti TC"]
+    plt.rcParams["axes.unicode_minus"] = False  # 解决负号显示问题
+    return plt
+
+
+def model_label(model):
+    if model.kind == 'poly':
+        return f'{len(model.coeffs) - 1}次多项式'
+    return '三次样条'
+
+
+def draw_comparison(ax, x, y, models, xlabel='开敞度 O (%)', ylabel='专注度 F', title=None, grid=None):
+    """
+    在坐标轴 ax 上绘制原始数据与已拟合模型的对比曲线（直接使用模型的 R²，不重新拟合）：
+    多项式依次用蓝、绿、紫、橙实线，样条用黑色虚线
+    """
+    grid = np.linspace(0, 100, 500) if grid is None else grid
+    colors = iter(['blue', 'green', 'purple', 'orange', 'brown', 'gray'])
+    ax.scatter(x, y, color='red', label='原始数据')
+    for model in models:
+        style = dict(color=next(colors)) if model.kind == 'poly' else dict(color='black', linestyle='--')
+        ax.plot(grid, model(grid), label=f'{model_label(model)} (R²={model.r2:.4f})', **style)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title(title or f'开敞度与{ylabel}的拟合模型对比')
+    ax.legend()
+    ax.grid(True)
+
+
+def dataset_stem(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def unique_stems(paths):
+    """
+    每个数据集对应的唯一文件名前缀：文件名重复时（如不同目录下的同名 CSV）依次尝试 _2、_3……直到未被占用
+    """
+    used = set()
+    stems = []
+    for path in paths:
+        stem = candidate = dataset_stem(path)
+        suffix = 1
+        while candidate in used:
+            suffix += 1
+            candidate = f"{stem}_{suffix}"
+        used.add(candidate)
+        stems.append(candidate)
+    return stems
+
+
+def load_dataset(path):
+    """
+    读取两列 CSV 数据集（开敞度 O，专注度 F 或得分 S），首行可为表头；返回 (x, y)
+    """
+    with open(path, encoding='utf-8-sig') as f:
+        first = f.readline()
+    try:
+        [float(value) for value in first.split(',')]
+        skiprows = 0
+    except ValueError:
+        skiprows = 1
+    x, y = np.loadtxt(path, delimiter=',', skiprows=skiprows, usecols=(0, 1), unpack=True, ndmin=2)
+    return x, y
+
+
+def expand_datasets(paths):
+    """
+    展开命令行给出的数据集：目录替换为其中按文件名排序的全部 CSV，文件原样保留
+    """
+    expanded = []
+    for path in paths:
+        expanded.extend(sorted(glob.glob(os.path.join(path, '*.csv'))) if os.path.isdir(path) else [path])
+    return expanded
+
+
+def save_model(model, path):
+    """
+    保存为 npz 文件，加载时不需要重新拟合，也不需要 scipy
+    """
+    np.savez(path, name=model.name, kind=model.kind, coeffs=model.coeffs,
+             breaks=np.array([]) if model.breaks is None else model.breaks,
+             r2=model.r2, rmse=model.rmse)
+
+
+def load_model(path):
+    with np.load(path) as data:
+        return FittedModel(str(data['name']), str(data['kind']), data['coeffs'],
+                           data['breaks'] if data['breaks'].size else None,
+                           float(data['r2']), float(data['rmse']))
+
+
+def run_fitting_cli(description, datasets_help, analyze, x, y, default_figure, figure_suffix):
+    """
+    各拟合脚本共用的命令行入口：不指定数据集时用脚本内的原始数据 (x, y) 调用
+    analyze(x, y, plot, figure_path, headless)，否则逐个数据集（目录展开为其中的 CSV）调用，
+    图像名为 <数据集名><figure_suffix>.png，同名数据集的图像名按 unique_stems 区分
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('datasets', nargs='*', help=datasets_help)
+    parser.add_argument('--headless', action='store_true', help='无界面批量模式：使用非交互式后端，图像只写入文件')
+    parser.add_argument('--no-plot', action='store_true', help='不绘图，也不导入 matplotlib')
+    parser.add_argument('--out-dir', default='.', help='图像输出目录')
+    args = parser.parse_args()
+    if not args.no_plot:
+        os.makedirs(args.out_dir, exist_ok=True)
+
+    if not args.datasets:
+        analyze(x, y, not args.no_plot, os.path.join(args.out_dir, default_figure), args.headless)
+        return
+    paths = expand_datasets(args.datasets)
+    for path, stem in zip(paths, unique_stems(paths)):
+        print(f"\n数据集：{path}")
+        data_x, data_y = load_dataset(path)
+        figure_path = os.path.join(args.out_dir, f"{stem}{figure_suffix}.png")
+        analyze(data_x, data_y, not args.no_plot, figure_path, args.headless)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='拟合已注册的模型并保存为 npz 模型文件')
+    parser.add_argument('datasets', nargs='+', help='两列 CSV 数据集（O, F/S）')
+    parser.add_argument('--models', nargs='+', default=list(DEFAULT_MODELS), help='要拟合的模型名称')
+    parser.add_argument('-o', '--out-dir', default='models', help='模型文件输出目录')
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    for path in args.datasets:
+        x, y = load_dataset(path)
+        stem = dataset_stem(path)
+        print(f"{stem}:")
+        for name, model in fit_models(x, y, args.models).items():
+            model_path = os.path.join(args.out_dir, f"{stem}_{name}.npz")
+            save_model(model, model_path)
+            print(f"  {name}: R² = {model.r2:.6f}, RMSE = {model.rmse:.6f} → {model_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import csv
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from 拟合模型库 import DEFAULT_MODELS, dataset_stem, expand_datasets, fit_model, load_dataset
+
+# 交叉验证折数，None 表示留一法
+FOLDS = None
+
+
+def cv_folds(n, folds=FOLDS, seed=0):
+    """
+    返回各折的测试集下标；folds 为 None 或不小于样本数时为留一法
+    """
+    if folds is None or folds >= n:
+        return [np.array([i]) for i in range(n)]
+    return np.array_split(np.random.default_rng(seed).permutation(n), folds)
+
+
+def cross_validate(x, y, names=DEFAULT_MODELS, folds=FOLDS, seed=0):
+    """
+    对每个候选模型做 k 折（默认留一法）交叉验证，返回 {name: (cv_rmse, cv_r2)}，
+    cv_r2 = 1 - PRESS / SST 为预测 R²。
+    多项式模型只在开始时构造一次范德蒙德矩阵，各折与各阶数直接取其行列子集求最小二乘
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    center = (x.max() + x.min()) / 2
+    scale = (x.max() - x.min()) / 2 or 1.0
+    degrees = {name: int(name[4:]) for name in names if name.startswith('poly')}
+    vander = np.vander((x - center) / scale, max(degrees.values(), default=0) + 1, increasing=True)
+
+    predictions = {name: np.empty(len(x)) for name in names}
+    train = np.ones(len(x), dtype=bool)
+    for test in cv_folds(len(x), folds, seed):
+        train[:] = True
+        train[test] = False
+        for name in names:
+            if name in degrees:
+                columns = degrees[name] + 1
+                beta = np.linalg.lstsq(vander[train, :columns], y[train], rcond=None)[0]
+                predictions[name][test] = vander[test, :columns] @ beta
+            else:
+                predictions[name][test] = fit_model(name, x[train], y[train])(x[test])
+
+    ss_tot = np.sum((y - y.mean()) ** 2)
+    scores = {}
+    for name in names:
+        press = np.sum((y - predictions[name]) ** 2)
+        scores[name] = (np.sqrt(press / len(y)), 1 - press / ss_tot if ss_tot > 0 else np.nan)
+    return scores
+
+
+def _cross_validate_dataset(job):
+    path, names, folds, seed = job
+    x, y = load_dataset(path)
+    return dataset_stem(path), cross_validate(x, y, names, folds, seed)
+
+
+def select_models(paths, names=DEFAULT_MODELS, folds=FOLDS, seed=0, workers=None):
+    """
+    用进程池对每个参与者的数据集并行做交叉验证，返回按 (参与者, 排名) 排序的行：
+    (participant, model, cv_rmse, cv_r2, rank)，rank 为该参与者内按 cv_rmse 的名次（1 为最好）
+    """
+    jobs = [(path, tuple(names), folds, seed) for path in paths]
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for participant, scores in pool.map(_cross_validate_dataset, jobs, chunksize=8):
+            ranked = sorted(scores.items(), key=lambda item: np.nan_to_num(item[1][0], nan=np.inf))
+            for rank, (name, (cv_rmse, cv_r2)) in enumerate(ranked, start=1):
+                rows.append((participant, name, cv_rmse, cv_r2, rank))
+    return rows
+
+
+def summarize(rows, names=DEFAULT_MODELS):
+    """
+    汇总全部参与者：返回按平均名次排序的 (model, mean_rank, median_cv_rmse, wins)
+    """
+    summary = []
+    for name in names:
+        ranks = np.array([row[4] for row in rows if row[1] == name])
+        cv_rmse = np.array([row[2] for row in rows if row[1] == name])
+        summary.append((name, ranks.mean(), np.nanmedian(cv_rmse), int(np.sum(ranks == 1))))
+    return sorted(summary, key=lambda item: item[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='交叉验证选择开敞度拟合模型（多参与者并行）')
+    parser.add_argument('datasets', nargs='+', help='各参与者的两列 CSV 数据集，或包含这些 CSV 的目录')
+    parser.add_argument('--models', nargs='+', default=list(DEFAULT_MODELS), help='候选模型名称')
+    parser.add_argument('--folds', type=int, default=FOLDS, help='交叉验证折数（默认留一法）')
+    parser.add_argument('--seed', type=int, default=0, help='k 折划分的随机种子')
+    parser.add_argument('--workers', type=int, default=None, help='并行进程数')
+    parser.add_argument('-o', '--output', default='model_selection.csv', help='逐参与者排名表的输出路径')
+    args = parser.parse_args()
+
+    paths = expand_datasets(args.datasets)
+    rows = select_models(paths, args.models, args.folds, args.seed, args.workers)
+
+    with open(args.output, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['participant', 'model', 'cv_rmse', 'cv_r2', 'rank'])
+        writer.writerows(rows)
+
+    print(f"{len(paths)} 个数据集的交叉验证排名（逐参与者结果见 {args.output}）：")
+    print(f"{'模型':<8}{'平均名次':>10}{'CV RMSE 中位数':>16}{'最优次数':>10}")
+    for name, mean_rank, median_rmse, wins in summarize(rows, args.models):
+        print(f"{name:<8}{mean_rank:>10.2f}{median_rmse:>16.4f}{wins:>10d}")
+
+
+if __name__ == "__main__":
+    main()
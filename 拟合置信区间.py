@@ -0,0 +1,103 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from 拟合模型库 import average_duplicates, dataset_stem, fit_model, load_dataset
+
+# 重抽样次数与置信水平
+N_BOOT = 2000
+ALPHA = 0.05
+
+# 计算置信带的开敞度网格（%）
+GRID = np.linspace(0, 100, 501)
+
+# 非多项式模型每个工作进程一次处理的重抽样数
+CHUNK = 200
+
+
+def polynomial_curves(x, y, degree, indices, grid=GRID):
+    """
+    多项式重抽样：把全部重抽样的范德蒙德设计矩阵堆叠为 (B, n, degree+1)，一次批量伪逆求解，
+    返回每个有效重抽样在 grid 上的拟合曲线 (B_valid, len(grid))。
+    自变量先缩放到 [-1, 1] 以改善高次项的条件数；不同取值少于 degree+1 个的重抽样无法定阶，被剔除。
+    """
+    center = (x.max() + x.min()) / 2
+    scale = (x.max() - x.min()) / 2 or 1.0
+    powers = np.arange(degree + 1)
+    design = ((x[indices] - center) / scale)[..., None] ** powers
+    valid = np.linalg.matrix_rank(design) == degree + 1
+    beta = np.linalg.pinv(design[valid]) @ y[indices[valid]][..., None]
+    grid_design = ((grid - center) / scale)[:, None] ** powers
+    return beta[..., 0] @ grid_design.T
+
+
+def _model_curves(job):
+    name, x, y, indices, grid = job
+    curves = []
+    for idx in indices:
+        # 重抽样中的重复点取均值后不足 4 个不同节点时跳过
+        unique_x, unique_y = average_duplicates(x[idx], y[idx])
+        if len(unique_x) < 4:
+            continue
+        curves.append(fit_model(name, unique_x, unique_y)(grid))
+    return np.array(curves).reshape(-1, len(grid))
+
+
+def model_curves(name, x, y, indices, grid=GRID, workers=None):
+    """
+    非多项式模型（如样条）的重抽样：按 CHUNK 分块，分配到多个进程逐个拟合
+    """
+    jobs = [(name, x, y, indices[i:i + CHUNK], grid) for i in range(0, len(indices), CHUNK)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return np.concatenate(list(pool.map(_model_curves, jobs)))
+
+
+def bootstrap_fit(name, x, y, n_boot=N_BOOT, grid=GRID, alpha=ALPHA, seed=None, workers=None):
+    """
+    自助法置信区间，返回 (bands, optimal_O, n_valid)：
+    bands 形状为 (3, len(grid))，依次为 F(O) 的下限、中位数、上限；
+    optimal_O 形状为 (3,)，为 F 取最大值处开敞度的下限、中位数、上限；n_valid 为有效重抽样数
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    grid = np.asarray(grid, dtype=float)
+    indices = np.random.default_rng(seed).integers(0, len(x), size=(n_boot, len(x)))
+    if name.startswith('poly'):
+        curves = polynomial_curves(x, y, int(name[4:]), indices, grid)
+    else:
+        curves = model_curves(name, x, y, indices, grid, workers)
+    quantiles = [100 * alpha / 2, 50, 100 * (1 - alpha / 2)]
+    bands = np.percentile(curves, quantiles, axis=0)
+    optimal_O = np.percentile(grid[np.argmax(curves, axis=1)], quantiles)
+    return bands, optimal_O, len(curves)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='多项式与样条拟合的自助法置信区间')
+    parser.add_argument('datasets', nargs='+', help='两列 CSV 数据集（O, F/S）')
+    parser.add_argument('--models', nargs='+', default=['poly4', 'spline'], help='模型名称')
+    parser.add_argument('--n-boot', type=int, default=N_BOOT, help='重抽样次数')
+    parser.add_argument('--alpha', type=float, default=ALPHA, help='显著性水平（默认 95%% 置信区间）')
+    parser.add_argument('--seed', type=int, default=None, help='随机种子')
+    parser.add_argument('--workers', type=int, default=None, help='样条重抽样的进程数')
+    parser.add_argument('-o', '--out-dir', default='bootstrap', help='置信带 npz 输出目录')
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    for path in args.datasets:
+        x, y = load_dataset(path)
+        stem = dataset_stem(path)
+        print(f"{stem}:")
+        for name in args.models:
+            bands, optimal_O, n_valid = bootstrap_fit(name, x, y, args.n_boot, GRID, args.alpha,
+                                                      args.seed, args.workers)
+            out_path = os.path.join(args.out_dir, f"{stem}_{name}_bootstrap.npz")
+            np.savez(out_path, grid=GRID, bands=bands, optimal_O=optimal_O)
+            print(f"  {name}: 有效重抽样 {n_valid}/{args.n_boot}，"
+                  f"最优开敞度 {optimal_O[1]:.2f}% [{optimal_O[0]:.2f}%, {optimal_O[2]:.2f}%] → {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,47 +1,202 @@
+import argparse
+import csv
+import re
+import sys
+from bisect import bisect_left
+from itertools import islice
+
 import numpy as np
 
+# F(O) 四次多项式拟合系数（从高次到低次）
+COEFFS = [-0.000038, 0.007576, -0.463138, 8.205234, 56.921186]
+
+# 开敞度 O 的有效范围（%）
+O_MIN, O_MAX = 0.0, 100.0
+
+# 反查表网格间距（%），同时也是反查结果的误差上界
+TABLE_STEP = 1e-3
+
+# 批量模式每次读取并求解的行数
+BATCH_LINES = 100000
+
+
+class InverseTable:
+    """
+    F→O 反查表：按导数零点把 [lo, hi] 上的 F(O) 分成若干单调段，启动时为每段预先计算网格 F 值，
+    查询时对每段做二分查找 + 线性插值。每段单调，真解与插值结果落在同一网格区间内，误差不超过 step。
+    """
+
+    def __init__(self, coeffs=COEFFS, lo=O_MIN, hi=O_MAX, step=TABLE_STEP):
+        self.coeffs = np.asarray(coeffs, dtype=float)
+        self.derivative = np.polyder(self.coeffs)
+        self.step = step
+        critical = np.roots(np.polyder(coeffs))
+        critical = np.sort(critical[np.isreal(critical)].real)
+        bounds = [lo, *critical[(critical > lo) & (critical < hi)], hi]
+
+        self.segments = []
+        self.arrays = []
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            O = np.linspace(a, b, int(np.ceil((b - a) / step)) + 1)
+            F = np.polyval(coeffs, O)
+            if F[-1] < F[0]:
+                O, F = O[::-1], F[::-1]
+            # 极值点附近消除舍入误差造成的非单调，保证二分查找有效
+            F = np.maximum.accumulate(F)
+            # 单值查询用 bisect 在列表上二分，比逐次调用 np.searchsorted 开销小
+            self.segments.append((O.tolist(), F.tolist()))
+            self.arrays.append((O, F))
+
+    def query(self, F_target):
+        """
+        返回 [lo, hi] 内满足 F(O) = F_target 的全部 O（升序）
+        """
+        solutions = []
+        for O, F in self.segments:
+            if not F[0] <= F_target <= F[-1]:
+                continue
+            i = min(max(bisect_left(F, F_target), 1), len(F) - 1)
+            dF = F[i] - F[i - 1]
+            w = (F_target - F[i - 1]) / dF if dF > 0 else 0.0
+            O_solution = O[i - 1] + w * (O[i] - O[i - 1])
+            # 相邻两段在极值点处相接，同一个解只保留一次
+            if not any(abs(O_solution - s) <= self.step for s in solutions):
+                solutions.append(O_solution)
+        return np.array(sorted(solutions))
+
+    def query_batch(self, F_values, newton_steps=3):
+        """
+        向量化求解：每个单调段内用 np.searchsorted 定位网格区间并插值作初值，
+        再在该区间内做 newton_steps 次牛顿迭代得到精确根。
+        返回 (len(F_values), 段数) 数组，每行为升序排列的解，不足处为 NaN
+        """
+        F_values = np.asarray(F_values, dtype=float).ravel()
+        solutions = np.full((len(F_values), len(self.arrays)), np.nan)
+        for k, (O, F) in enumerate(self.arrays):
+            inside = (F_values >= F[0]) & (F_values <= F[-1])
+            target = F_values[inside]
+            i = np.clip(np.searchsorted(F, target), 1, len(F) - 1)
+            left, right = np.minimum(O[i - 1], O[i]), np.maximum(O[i - 1], O[i])
+            dF = F[i] - F[i - 1]
+            w = np.divide(target - F[i - 1], dF, out=np.zeros_like(target), where=dF > 0)
+            root = O[i - 1] + w * (O[i] - O[i - 1])
+            for _ in range(newton_steps):
+                slope = np.polyval(self.derivative, root)
+                delta = np.divide(np.polyval(self.coeffs, root) - target, slope,
+                                  out=np.zeros_like(root), where=slope != 0)
+                # 牛顿步限制在网格区间内，极值点附近也不会跳出
+                root = np.clip(root - delta, left, right)
+            solutions[inside, k] = root
+        solutions = np.sort(solutions, axis=1)
+        # 相邻两段在极值点处相接，重复的解只保留一次
+        duplicate = np.zeros(solutions.shape, dtype=bool)
+        duplicate[:, 1:] = np.abs(np.diff(solutions, axis=1)) <= self.step
+        solutions[duplicate] = np.nan
+        return np.sort(solutions, axis=1)
+
+
+# 启动时构建一次反查表
+INVERSE_TABLE = InverseTable()
+
 
 def find_O_from_F(F_target):
-    # 构造多项式系数（常数项减去 F_target）
-    coeffs = [
-        -0.000038,
-        0.007576,
-        -0.463138,
-        8.205234,
-        56.921186 - F_target
-    ]
-    # 求解多项式的所有根
-    roots = np.roots(coeffs)
-    # 提取实数部分
-    real_roots = roots[np.isreal(roots)].real
-    return real_roots
-
-
-# 主程序：交互式输入F值
-while True:
-    try:
-        # 获取用户输入
-        user_input = input("请输入F值（输入q退出）：")
+    # 在有效开敞度范围内查表求解 F(O) = F_target
+    return INVERSE_TABLE.query(F_target)
 
-        # 检查是否退出
-        if user_input.lower() == 'q':
+
+def find_O_from_F_batch(F_values):
+    """
+    批量求解：对数组中的全部 F 一次性向量化求根，返回 (len(F_values), 段数) 数组，
+    每行为有效开敞度范围内的解（升序），不足处为 NaN
+    """
+    return INVERSE_TABLE.query_batch(F_values)
+
+
+def read_F_values(lines):
+    # 每行可包含一个或多个以逗号或空白分隔的 F 值，无法解析的内容（如表头）跳过并在标准错误中提示；
+    # 开头的 BOM 一并去掉（标准输入不经过 utf-8-sig 解码）
+    values = []
+    for line in lines:
+        for token in re.split(r'[,\s]+', line.strip().lstrip('\ufeff')):
+            if not token:
+                continue
+            try:
+                values.append(float(token))
+            except ValueError:
+                print(f"跳过无法解析的值：{token!r}", file=sys.stderr)
+    return values
+
+
+def solve_stream(source, target, batch_lines=BATCH_LINES):
+    """
+    从 source 流式读取 F 值，按批向量化求解，以 CSV 写出 F,O1,...,O4（无解处留空）
+    """
+    writer = csv.writer(target)
+    writer.writerow(['F'] + [f'O{i + 1}' for i in range(len(INVERSE_TABLE.arrays))])
+    count = 0
+    while True:
+        lines = list(islice(source, batch_lines))
+        if not lines:
             break
+        F_values = read_F_values(lines)
+        for F_value, O_row in zip(F_values, find_O_from_F_batch(F_values)):
+            writer.writerow([f"{F_value:g}"] + [f"{O:.6f}" if O == O else '' for O in O_row])
+        count += len(F_values)
+    return count
+
+
+def interactive():
+    # 主程序：交互式输入F值
+    while True:
+        try:
+            # 获取用户输入
+            user_input = input("请输入F值（输入q退出）：")
 
-        # 将输入转换为浮点数
-        F_value = float(user_input)
+            # 检查是否退出
+            if user_input.lower() == 'q':
+                break
 
-        # 计算对应的O值
-        O_solutions = find_O_from_F(F_value)
+            # 将输入转换为浮点数
+            F_value = float(user_input)
 
-        # 输出结果
-        if len(O_solutions) > 0:
-            print(f"当 F = {F_value} 时，可能的O值有：{O_solutions}")
-        else:
-            print(f"当 F = {F_value} 时，没有找到实数解。")
+            # 计算对应的O值
+            O_solutions = find_O_from_F(F_value)
+
+            # 输出结果
+            if len(O_solutions) > 0:
+                print(f"当 F = {F_value} 时，可能的O值有：{O_solutions}")
+            else:
+                print(f"当 F = {F_value} 时，在 {O_MIN:g}–{O_MAX:g} 范围内没有找到解。")
+
+        except ValueError:
+            print("输入无效，请输入一个数字或q退出。")
+        except Exception as e:
+            print(f"发生错误：{e}")
+
+    print("程序已退出。")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='由专注度 F 反算开敞度 O；不带参数时进入交互模式')
+    parser.add_argument('--batch', nargs='?', const='-', metavar='FILE',
+                        help='批量模式：从文件（默认标准输入）读取 F 值，输出 CSV')
+    parser.add_argument('-o', '--output', default='-', help='批量模式的输出 CSV（默认标准输出）')
+    args = parser.parse_args()
+
+    if args.batch is None:
+        interactive()
+        return
+    source = sys.stdin if args.batch == '-' else open(args.batch, encoding='utf-8-sig')
+    target = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+    try:
+        count = solve_stream(source, target)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    print(f"已求解 {count} 个 F 值", file=sys.stderr)
 
-    except ValueError:
-        print("输入无效，请输入一个数字或q退出。")
-    except Exception as e:
-        print(f"发生错误：{e}")
 
-print("程序已退出。")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
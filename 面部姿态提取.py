@@ -1,30 +1,412 @@
-import pandas as pd
+import argparse
+import csv
+import glob
+import json  # Keypoints 为 JSON 数组，json 解析比 ast.literal_eval 快得多
+import os
 import re
-import ast  # 用于安全地将字符串转换为 Python 对象
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# 面部关键点索引（第 27、28、30 个 keypoint）及对应的输出列名
+FACE_INDICES = (26, 27, 29)
+FACE_COLUMNS = ('面部1', '面部2', '面部3')
 
-# 读取CSV文件
-df = pd.read_csv('try1.csv', header=None)
+# 流式模式下每次读取的行数
+CHUNK_SIZE = 10000
+
+# 捕获文件第一列时间戳的单位换算为秒（默认为毫秒）
+TIMESTAMP_SCALE = 1e-3
+
+# 跟踪模式下无新数据时的轮询间隔（秒）及每次读取的字节数
+FOLLOW_INTERVAL = 0.005
+FOLLOW_READ_SIZE = 1 << 20
 
 # 提取 "Keypoints": 到 ,"KeypointConfidence" 之间的内容
+KEYPOINTS_PATTERN = re.compile(r'"Keypoints"\s*:\s*(\[.*?\])\s*,\s*"KeypointConfidence"')
+# 同时提取 Keypoints 与 KeypointConfidence 两个数组
+FRAME_PATTERN = re.compile(
+    r'"Keypoints"\s*:\s*(\[.*?\])\s*,\s*"KeypointConfidence"\s*:\s*(\[.*?\])')
+
+
 def extract_keypoints(text):
-    match = re.search(r'"Keypoints"\s*:\s*(\[.*?\])\s*,\s*"KeypointConfidence"', text)
+    if not isinstance(text, str):
+        return None
+    match = KEYPOINTS_PATTERN.search(text)
     return match.group(1) if match else None
 
-# 新增列：提取 Keypoints 原始字符串
-df['ExtractedKeypoints'] = df[1].apply(extract_keypoints)
 
-# 将 JSON 字符串转为 Python 列表并提取第 27、28、30 个 keypoint
-def get_keypoint(json_str, index):
+def parse_keypoints(json_str):
+    """
+    将 Keypoints 字符串解析为 Python 列表，解析失败返回 None
+    """
     try:
-        keypoints = ast.literal_eval(json_str)
-        return keypoints[index] if index < len(keypoints) else None
-    except:
+        return json.loads(json_str)
+    except (TypeError, ValueError):
         return None
 
-# 提取面部关键点（索引：26、27、29）
-df['面部1'] = df['ExtractedKeypoints'].apply(lambda x: get_keypoint(x, 26))
-df['面部2'] = df['ExtractedKeypoints'].apply(lambda x: get_keypoint(x, 27))
-df['面部3'] = df['ExtractedKeypoints'].apply(lambda x: get_keypoint(x, 29))
 
-# 保存新表格
-df.to_csv('output.csv', index=False)
\ No newline at end of file
+def get_keypoint(keypoints, index):
+    return keypoints[index] if keypoints is not None and index < len(keypoints) else None
+
+
+def add_face_columns(df):
+    """
+    为数据表新增 ExtractedKeypoints 及面部关键点列，每行的 Keypoints 只解析一次
+    """
+    df['ExtractedKeypoints'] = df[1].map(extract_keypoints)
+    parsed = df['ExtractedKeypoints'].map(parse_keypoints)
+    for column, index in zip(FACE_COLUMNS, FACE_INDICES):
+        df[column] = parsed.map(lambda keypoints: get_keypoint(keypoints, index))
+    return df
+
+
+def extract_file(input_path, output_path):
+    """
+    一次性读入整个 CSV 并提取面部关键点（适合小文件）
+    """
+    df = pd.read_csv(input_path, header=None)
+    add_face_columns(df).to_csv(output_path, index=False)
+    return len(df)
+
+
+def extract_stream(input_path, output_path, chunksize=CHUNK_SIZE):
+    """
+    分块流式提取：每读入 chunksize 行就处理并追加写入，内存占用与文件大小无关
+    """
+    rows = 0
+    for i, chunk in enumerate(pd.read_csv(input_path, header=None, chunksize=chunksize)):
+        add_face_columns(chunk).to_csv(output_path, mode='w' if i == 0 else 'a',
+                                       header=(i == 0), index=False)
+        rows += len(chunk)
+    return rows
+
+
+def parse_frame(text):
+    """
+    解析一帧的 Keypoints 与 KeypointConfidence，返回 (keypoints, confidence)，失败时为 (None, None)
+    """
+    match = FRAME_PATTERN.search(text) if isinstance(text, str) else None
+    if match is None:
+        return None, None
+    return parse_keypoints(match.group(1)), parse_keypoints(match.group(2))
+
+
+class NpyAppender:
+    """
+    可追加写入的 .npy 文件：先写入文件头，每次 append 直接写到文件末尾，
+    close 时回填真实帧数。结果可用 np.load(path, mmap_mode='r') 零拷贝读取。
+    """
+    HEADER_SIZE = 128  # 魔数 + 版本 + 长度字段 + 头部字典，按 64 字节对齐
+    MAGIC = b'\x93NUMPY\x01\x00'
+
+    def __init__(self, path, frame_shape, dtype=np.float32):
+        self.path = path
+        self.frame_shape = tuple(frame_shape)
+        self.dtype = np.dtype(dtype)
+        self.frames = 0
+        self.file = open(path, 'wb')
+        self._write_header()
+
+    def _write_header(self):
+        header = repr({
+            'descr': np.lib.format.dtype_to_descr(self.dtype),
+            'fortran_order': False,
+            'shape': (self.frames,) + self.frame_shape,
+        }).encode('latin1')
+        header_len = self.HEADER_SIZE - len(self.MAGIC) - 2
+        self.file.seek(0)
+        self.file.write(self.MAGIC + struct.pack('<H', header_len) + header.ljust(header_len - 1) + b'\n')
+        self.file.seek(0, 2)
+
+    def append(self, block):
+        block = np.ascontiguousarray(block, dtype=self.dtype)
+        if block.shape[1:] != self.frame_shape:
+            raise ValueError(f"帧形状 {block.shape[1:]} 与文件 {self.frame_shape} 不一致")
+        self.file.write(block.tobytes())
+        self.frames += len(block)
+
+    def close(self):
+        if not self.file.closed:
+            self._write_header()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def frames_to_arrays(frames, n_keypoints, n_dims):
+    """
+    将解析后的 (keypoints, confidence) 列表填入 (帧, 关键点, 维度) 与 (帧, 关键点) 数组，缺失处为 NaN
+    """
+    keypoints = np.full((len(frames), n_keypoints, n_dims), np.nan, dtype=np.float32)
+    confidence = np.full((len(frames), n_keypoints), np.nan, dtype=np.float32)
+    for i, (kp, conf) in enumerate(frames):
+        if kp is not None:
+            try:
+                keypoints[i] = kp
+            except (TypeError, ValueError):
+                # 关键点数量或维度与首帧不一致时逐点填充
+                for j, point in enumerate(kp[:n_keypoints]):
+                    try:
+                        keypoints[i, j, :len(point)] = point[:n_dims]
+                    except (TypeError, ValueError):
+                        pass
+        if conf is not None:
+            try:
+                confidence[i] = conf
+            except (TypeError, ValueError):
+                pass
+    return keypoints, confidence
+
+
+def array_paths(prefix):
+    return f"{prefix}_keypoints.npy", f"{prefix}_confidence.npy"
+
+
+def timestamps_path(prefix):
+    return f"{prefix}_timestamps.npy"
+
+
+def frame_times(raw, fps, timestamp_scale=TIMESTAMP_SCALE):
+    """
+    把捕获文件第一列的原始时间戳换算为每帧的采集时刻（秒）；缺失（NaN）的帧按帧率接在上一个有效帧之后，
+    首个有效帧之前的帧从 0 起算，与在线模式逐行推算的结果相同
+    """
+    raw = np.asarray(raw, dtype=float)
+    frame = np.arange(len(raw))
+    last = np.maximum.accumulate(np.where(np.isnan(raw), -1, frame)) if len(raw) else frame
+    safe_last = np.maximum(last, 0)
+    return np.where(last >= 0, raw[safe_last] * timestamp_scale + (frame - safe_last) / fps, frame / fps)
+
+
+def load_frame_times(prefix, n_frames, fps, timestamp_scale=TIMESTAMP_SCALE):
+    """
+    读取 <prefix>_timestamps.npy 并换算为秒；旧版输出没有该文件时按帧率推算
+    """
+    path = timestamps_path(prefix)
+    if not os.path.exists(path):
+        return np.arange(n_frames) / fps
+    return frame_times(np.load(path), fps, timestamp_scale)
+
+
+def extract_arrays(input_path, prefix, chunksize=CHUNK_SIZE):
+    """
+    流式解码全部帧，写出 <prefix>_keypoints.npy (帧, 关键点, 维度) 与 <prefix>_confidence.npy (帧, 关键点)，
+    以及第一列的原始时间戳 <prefix>_timestamps.npy (帧,)（无法解析处为 NaN）；关键点数量与维度取自第一个有效帧
+    """
+    keypoints_path, confidence_path = array_paths(prefix)
+    writers = None
+    pending = 0  # 首个有效帧之前的无效帧数
+    ts_writer = NpyAppender(timestamps_path(prefix), (), dtype=np.float64)
+    for chunk in pd.read_csv(input_path, header=None, usecols=[0, 1], chunksize=chunksize):
+        ts_writer.append(pd.to_numeric(chunk[0], errors='coerce').to_numpy(dtype=float))
+        frames = [parse_frame(text) for text in chunk[1]]
+        if writers is None:
+            first = next((kp for kp, _ in frames if kp), None)
+            if first is None:
+                pending += len(frames)
+                continue
+            shape = (len(first), len(first[0]))
+            writers = NpyAppender(keypoints_path, shape), NpyAppender(confidence_path, shape[:1])
+            if pending:
+                writers[0].append(np.full((pending,) + shape, np.nan))
+                writers[1].append(np.full((pending,) + shape[:1], np.nan))
+        keypoints, confidence = frames_to_arrays(frames, *writers[0].frame_shape)
+        writers[0].append(keypoints)
+        writers[1].append(confidence)
+    if writers is None:
+        writers = NpyAppender(keypoints_path, (0, 0)), NpyAppender(confidence_path, (0,))
+        writers[0].append(np.empty((pending, 0, 0)))
+        writers[1].append(np.empty((pending, 0)))
+    for writer in (*writers, ts_writer):
+        writer.close()
+    return writers[0].frames
+
+
+def load_arrays(prefix):
+    """
+    以内存映射方式打开 extract_arrays 的输出，返回 (keypoints, confidence)
+    """
+    keypoints_path, confidence_path = array_paths(prefix)
+    return np.load(keypoints_path, mmap_mode='r'), np.load(confidence_path, mmap_mode='r')
+
+
+def find_captures(pattern):
+    """
+    返回目录下全部 CSV 或通配符匹配到的捕获文件（按路径排序）
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '*.csv')
+    return sorted(glob.glob(pattern))
+
+
+def _extract_shard(job):
+    input_path, prefix, chunksize = job
+    return input_path, prefix, extract_arrays(input_path, prefix, chunksize)
+
+
+def merge_shards(shards, prefix, chunksize=CHUNK_SIZE):
+    """
+    将各会话的分片数组按顺序拼接为一个数据集，并写出 <prefix>_index.csv 记录每个会话的帧区间
+    关键点数量或维度不同的会话以 NaN 补齐；各会话的原始时间戳原样拼接
+    """
+    opened = [(path, load_arrays(shard)) for path, shard, _ in shards]
+    n_keypoints = max((kp.shape[1] for _, (kp, _) in opened), default=0)
+    n_dims = max((kp.shape[2] for _, (kp, _) in opened), default=0)
+    keypoints_path, confidence_path = array_paths(prefix)
+    index = []
+    with NpyAppender(keypoints_path, (n_keypoints, n_dims)) as kp_writer, \
+            NpyAppender(confidence_path, (n_keypoints,)) as conf_writer, \
+            NpyAppender(timestamps_path(prefix), (), dtype=np.float64) as ts_writer:
+        for (path, (keypoints, confidence)), (_, shard, _) in zip(opened, shards):
+            start = kp_writer.frames
+            ts_writer.append(np.load(timestamps_path(shard), mmap_mode='r'))
+            for i in range(0, len(keypoints), chunksize):
+                kp_block = np.full((len(keypoints[i:i + chunksize]), n_keypoints, n_dims), np.nan, np.float32)
+                conf_block = np.full(kp_block.shape[:2], np.nan, np.float32)
+                kp_block[:, :keypoints.shape[1], :keypoints.shape[2]] = keypoints[i:i + chunksize]
+                conf_block[:, :confidence.shape[1]] = confidence[i:i + chunksize]
+                kp_writer.append(kp_block)
+                conf_writer.append(conf_block)
+            index.append({
+                'session': os.path.splitext(os.path.basename(path))[0],
+                'source': path,
+                'start': start,
+                'stop': kp_writer.frames,
+            })
+    index_path = f"{prefix}_index.csv"
+    pd.DataFrame(index, columns=['session', 'source', 'start', 'stop']).to_csv(index_path, index=False)
+    return index_path
+
+
+def extract_batch(pattern, output_dir, workers=None, chunksize=CHUNK_SIZE):
+    """
+    批量模式：用进程池并行解码多个会话的捕获文件，分片写入 output_dir/shards，
+    再合并为 output_dir/dataset_*.npy 及帧区间索引 output_dir/dataset_index.csv
+    """
+    files = find_captures(pattern)
+    if not files:
+        raise FileNotFoundError(f"没有找到匹配 {pattern} 的捕获文件")
+    shard_dir = os.path.join(output_dir, 'shards')
+    os.makedirs(shard_dir, exist_ok=True)
+    jobs = [
+        (path, os.path.join(shard_dir, f"{i:05d}_{os.path.splitext(os.path.basename(path))[0]}"), chunksize)
+        for i, path in enumerate(files)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        shards = list(pool.map(_extract_shard, jobs))
+    return merge_shards(shards, os.path.join(output_dir, 'dataset'), chunksize)
+
+
+def read_checkpoint(path):
+    """
+    读取跟踪模式的检查点（已处理到的字节偏移量），不存在时返回 0
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            return int(json.load(f)['offset'])
+    except FileNotFoundError:
+        return 0
+
+
+def write_checkpoint(path, offset):
+    # 先写临时文件再原子替换，避免中途崩溃留下损坏的检查点
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'offset': offset}, f)
+    os.replace(tmp_path, path)
+
+
+def follow_capture(input_path, checkpoint_path=None, poll_interval=FOLLOW_INTERVAL, idle_timeout=None):
+    """
+    跟踪不断追加的捕获文件：从检查点记录的字节偏移量开始，只解码新追加的完整行，
+    逐帧产出 (row, keypoints, confidence)。每批新行处理完后更新检查点，重启后从断点继续。
+    idle_timeout 秒内没有新数据时结束（None 表示一直跟踪）。
+    """
+    offset = read_checkpoint(checkpoint_path) if checkpoint_path else 0
+    pending = b''  # 尚未以换行结尾的半行
+    idle_since = time.monotonic()
+    with open(input_path, 'rb') as f:
+        f.seek(offset)
+        while True:
+            if os.fstat(f.fileno()).st_size < offset + len(pending):
+                # 文件被截断或重建，从头开始
+                offset, pending = 0, b''
+                f.seek(0)
+            data = f.read(FOLLOW_READ_SIZE)
+            if not data:
+                if idle_timeout is not None and time.monotonic() - idle_since > idle_timeout:
+                    return
+                time.sleep(poll_interval)
+                continue
+            idle_since = time.monotonic()
+            pending += data
+            end = pending.rfind(b'\n') + 1
+            if not end:
+                continue
+            lines, pending = pending[:end], pending[end:]
+            for line in lines.decode('utf-8').split('\n'):
+                line = line.rstrip('\r')
+                if not line:
+                    continue
+                row = next(csv.reader([line]))
+                keypoints, confidence = parse_frame(row[1] if len(row) > 1 else None)
+                yield row, keypoints, confidence
+            offset += end
+            if checkpoint_path:
+                write_checkpoint(checkpoint_path, offset)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='从姿态捕获 CSV 中提取面部关键点')
+    parser.add_argument('input', nargs='?', default='try1.csv', help='捕获文件路径')
+    parser.add_argument('-o', '--output', default='output.csv', help='输出 CSV 路径')
+    parser.add_argument('--stream', action='store_true', help='分块流式处理，适合数 GB 的全天捕获日志')
+    parser.add_argument('--chunksize', type=int, default=CHUNK_SIZE, help='流式模式下每块的行数')
+    parser.add_argument('--npy', metavar='PREFIX',
+                        help='改为输出内存映射数组 PREFIX_keypoints.npy、PREFIX_confidence.npy 与 PREFIX_timestamps.npy')
+    parser.add_argument('--batch', metavar='DIR_OR_GLOB',
+                        help='批量模式：并行处理目录或通配符匹配的全部捕获文件')
+    parser.add_argument('--out-dir', default='dataset', help='批量模式的输出目录')
+    parser.add_argument('--workers', type=int, default=None, help='批量模式的进程数（默认等于 CPU 核数）')
+    parser.add_argument('--follow', action='store_true',
+                        help='跟踪模式：持续读取不断追加的捕获文件，按行输出面部关键点 JSON')
+    parser.add_argument('--checkpoint', help='跟踪模式的检查点文件（默认为 <input>.checkpoint）')
+    args = parser.parse_args()
+
+    if args.follow:
+        try:
+            for row, keypoints, _ in follow_capture(args.input, args.checkpoint or f"{args.input}.checkpoint"):
+                frame = {'0': row[0]}
+                for column, index in zip(FACE_COLUMNS, FACE_INDICES):
+                    frame[column] = get_keypoint(keypoints, index)
+                sys.stdout.write(json.dumps(frame, ensure_ascii=False) + '\n')
+                sys.stdout.flush()
+        except KeyboardInterrupt:
+            pass
+        return
+    if args.batch:
+        index_path = extract_batch(args.batch, args.out_dir, args.workers, args.chunksize)
+        print(f"批量处理完成，数据集索引保存至 {index_path}")
+        return
+    if args.npy:
+        frames = extract_arrays(args.input, args.npy, args.chunksize)
+        print(f"已解码 {frames} 帧，结果保存至 {' / '.join((*array_paths(args.npy), timestamps_path(args.npy)))}")
+        return
+    if args.stream:
+        rows = extract_stream(args.input, args.output, args.chunksize)
+    else:
+        rows = extract_file(args.input, args.output)
+    print(f"已处理 {rows} 行，结果保存至 {args.output}")
+
+
+if __name__ == "__main__":
+    main()